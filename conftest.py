@@ -1,9 +1,13 @@
 """PyTest configuration file."""
+import copy
+import functools
+import hashlib
 import json
+import os
 import random
 import re
-from pathlib import Path
-from typing import Any, Callable, Optional, Union
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import numpy
 import pytest
@@ -11,7 +15,6 @@ import torch
 from concrete.fhe import Graph as CNPGraph
 from concrete.fhe.compilation import Circuit, Configuration
 from concrete.fhe.mlir.utils import MAXIMUM_TLU_BIT_WIDTH
-from sklearn.datasets import make_classification, make_regression
 
 from concrete.ml.common.utils import (
     SUPPORTED_FLOAT_TYPES,
@@ -22,18 +25,12 @@ from concrete.ml.common.utils import (
     is_regressor_or_partial_regressor,
     to_tuple,
 )
-from concrete.ml.quantization.quantized_module import QuantizedModule
-from concrete.ml.sklearn import (
-    GammaRegressor,
-    PoissonRegressor,
-    TweedieRegressor,
-    get_sklearn_neural_net_models,
-)
-from concrete.ml.sklearn.base import (
-    BaseTreeEstimatorMixin,
-    QuantizedTorchEstimatorMixin,
-    SklearnLinearModelMixin,
-)
+
+# Heavy dependencies (sklearn, the Concrete ML models) are imported in the functions that
+# use them in order to reduce the time needed to load this file
+if TYPE_CHECKING:
+    from concrete.ml.quantization.quantized_module import QuantizedModule
+    from concrete.ml.sklearn.base import QuantizedTorchEstimatorMixin
 
 
 def pytest_addoption(parser):
@@ -63,24 +60,49 @@ def pytest_addoption(parser):
     )
 
 
+def get_key_cache_location() -> str:
+    """Get the location of the insecure key cache used in tests.
+
+    When tests are run in parallel with pytest-xdist, each worker gets its own key cache directory
+    so that workers do not contend on the same files.
+
+    Returns:
+        str: The key cache location.
+    """
+    return f"ConcreteNumpyKeyCache-{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}"
+
+
 # This is only for doctests where we currently cannot make use of fixtures
-original_compilation_config_init = Configuration.__init__
+CODEBLOCKS_CONFIGURATION_DEFAULTS = {
+    "dump_artifacts_on_unexpected_failures": False,
+    "enable_unsafe_features": True,  # This is for our tests only, never use that in prod
+    "treat_warnings_as_errors": True,
+    "use_insecure_key_cache": True,  # This is for our tests only, never use that in prod
+    "insecure_key_cache_location": get_key_cache_location(),
+}
 
 
+@functools.wraps(Configuration.__init__)
 def monkeypatched_compilation_configuration_init_for_codeblocks(
     self: Configuration, *args, **kwargs
 ):
     """Monkeypatched compilation configuration init for codeblocks tests."""
-    original_compilation_config_init(self, *args, **kwargs)
-    self.dump_artifacts_on_unexpected_failures = False
-    self.enable_unsafe_features = True  # This is for our tests only, never use that in prod
-    self.treat_warnings_as_errors = True
-    self.use_insecure_key_cache = True  # This is for our tests only, never use that in prod
-    self.insecure_key_cache_location = "ConcreteNumpyKeyCache"
+    # The original Configuration.__init__ is kept as __wrapped__ by functools.wraps
+    monkeypatched_compilation_configuration_init_for_codeblocks.__wrapped__(  # type: ignore
+        self, *args, **kwargs
+    )
+    self.__dict__.update(CODEBLOCKS_CONFIGURATION_DEFAULTS)
 
 
 def pytest_sessionstart(session: pytest.Session):
-    """Handle codeblocks Configuration if needed."""
+    """Handle codeblocks Configuration and coverage settings if needed."""
+
+    # Starting with Python 3.12, coverage can rely on sys.monitoring, which is much faster than
+    # its default tracer. The variable is only read by processes started after this point, such
+    # as the pytest-xdist workers
+    if sys.version_info >= (3, 12):
+        os.environ.setdefault("COVERAGE_CORE", "sysmon")
+
     if session.config.getoption("--codeblocks", default=False):
         # setattr to avoid mypy complaining
         # Disable the flake8 bug bear warning for the mypy fix
@@ -91,6 +113,28 @@ def pytest_sessionstart(session: pytest.Session):
         )
 
 
+def pytest_collection_modifyitems(config: pytest.Config, items):
+    """Skip the filtered tests.
+
+    Test files can define a `get_collection_skip_reason(params, is_weekly_option)` function, which
+    returns the reason for skipping a test from its parameters (or None). These tests are then
+    skipped at collection time, before their fixtures are set up.
+    """
+    is_weekly = config.getoption("--weekly")
+
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec is None:
+            continue
+
+        get_collection_skip_reason = getattr(item.module, "get_collection_skip_reason", None)
+        if get_collection_skip_reason is not None:
+            skip_reason = get_collection_skip_reason(callspec.params, is_weekly)
+
+            if skip_reason is not None:
+                item.add_marker(pytest.mark.skip(reason=skip_reason))
+
+
 def pytest_sessionfinish(session: pytest.Session, exitstatus):  # pylint: disable=unused-argument
     """Pytest callback when testing ends."""
     # Hacked together from the source code, they don't have an option to export to file and it's too
@@ -112,88 +156,150 @@ def pytest_sessionfinish(session: pytest.Session, exitstatus):  # pylint: disabl
                 failed = cov_plugin.cov_total < cov_plugin.options.cov_fail_under
                 # If failed is False coverage_status is 0, if True it's 1
                 coverage_status = int(failed)
-            global_coverage_file_path = Path(global_coverage_file).resolve()
-            with open(global_coverage_file_path, "w", encoding="utf-8") as f:
-                json.dump({"exit_code": coverage_status, "content": coverage_txt}, f)
+            with open(global_coverage_file, "w", encoding="utf-8") as f:
+                # The report can be large: avoid escaping non-ASCII characters and checking for
+                # circular references, which are not needed for such a simple object
+                json.dump(
+                    {"exit_code": coverage_status, "content": coverage_txt},
+                    f,
+                    ensure_ascii=False,
+                    check_circular=False,
+                )
 
 
-@pytest.fixture
-def default_configuration():
-    """Return the default test compilation configuration."""
+@pytest.fixture(scope="session")
+def default_configuration_template():
+    """Return the default test compilation configuration, built once per session."""
 
     return Configuration(
         dump_artifacts_on_unexpected_failures=False,
         enable_unsafe_features=True,  # This is for our tests only, never use that in prod
         use_insecure_key_cache=True,  # This is for our tests only, never use that in prod
-        insecure_key_cache_location="ConcreteNumpyKeyCache",
+        insecure_key_cache_location=get_key_cache_location(),
         jit=True,
     )
 
 
-@pytest.fixture
-def default_configuration_no_jit():
-    """Return the default test compilation configuration."""
+@pytest.fixture(scope="session")
+def default_configuration_no_jit_template():
+    """Return the default test compilation configuration, built once per session."""
 
     return Configuration(
         dump_artifacts_on_unexpected_failures=False,
         enable_unsafe_features=True,  # This is for our tests only, never use that in prod
         use_insecure_key_cache=True,  # This is for our tests only, never use that in prod
-        insecure_key_cache_location="ConcreteNumpyKeyCache",
+        insecure_key_cache_location=get_key_cache_location(),
         jit=False,
     )
 
 
-REMOVE_COLOR_CODES_RE = re.compile(r"\x1b[^m]*m")
+@pytest.fixture
+def default_configuration(default_configuration_template):
+    """Return the default test compilation configuration."""
+
+    # Tests get their own copy so that they can modify it without impacting other tests
+    return copy.copy(default_configuration_template)
+
+
+@pytest.fixture
+def default_configuration_no_jit(default_configuration_no_jit_template):
+    """Return the default test compilation configuration."""
+
+    # Tests get their own copy so that they can modify it without impacting other tests
+    return copy.copy(default_configuration_no_jit_template)
+
+
+# Matches ANSI escape sequences (CSI), which include color codes
+REMOVE_COLOR_CODES_RE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
+REMOVE_COLOR_CODES = functools.partial(REMOVE_COLOR_CODES_RE.sub, "")
 
 
 @pytest.fixture
 def remove_color_codes():
-    """Return the re object to remove color codes."""
-    return lambda x: REMOVE_COLOR_CODES_RE.sub("", x)
+    """Return the function to remove color codes."""
+    return REMOVE_COLOR_CODES
 
 
 def function_to_seed_torch(seed):
     """Seed torch, for determinism."""
-
     # Seed torch with something which is seed by pytest-randomly
     torch.manual_seed(seed)
-    torch.use_deterministic_algorithms(True)
+
+
+def get_sub_seed(main_seed: int, name: str) -> int:
+    """Derive a seed for a given random number generator from the main seed.
+
+    Hashing the main seed together with the generator's name decorrelates the different streams
+    and makes each sub-seed independent of the order in which the generators are seeded.
+
+    Args:
+        main_seed (int): The main seed of the test.
+        name (str): The name of the random number generator to seed.
+
+    Returns:
+        int: A 64-bit seed.
+    """
+    digest = hashlib.blake2b(f"{main_seed}:{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def autoseeding_of_torch_algorithms():
+    """Make torch use deterministic algorithms, once for the whole session."""
+
+    # The setting is global, avoid re-applying it if it is already enabled
+    if not torch.are_deterministic_algorithms_enabled():
+        torch.use_deterministic_algorithms(True)
 
 
 @pytest.fixture(autouse=True)
-def autoseeding_of_everything(record_property, request):
+def autoseeding_of_everything(request):
     """Seed everything we can, for determinism."""
     main_seed = request.config.getoption("--forcing_random_seed", default=None)
 
     if main_seed is None:
         main_seed = random.randint(0, 2**64 - 1)
 
-    seed = main_seed
-    record_property("main seed", main_seed)
+    # Store the main seed in the test's properties, as done by the record_property fixture. It is
+    # then written in the JUnit XML report and printed in the test report if the test fails, see
+    # pytest_runtest_makereport
+    request.node.user_properties.append(("main seed", main_seed))
 
     # Python
-    random.seed(seed)
-    print("\nForcing seed to random.seed to ", seed)
-    print(
-        f"\nRelaunch the tests with --forcing_random_seed {seed} "
-        + "--randomly-dont-reset-seed to reproduce. Remark that adding --randomly-seed=... "
-        + "is needed when the testcase uses randoms in pytest parameters"
-    )
-    print(
-        "Remark that potentially, any option used in the pytest call may have an impact so in "
-        + "case of problem to reproduce, you may want to have a look to `make pytest` options"
-    )
+    random.seed(get_sub_seed(main_seed, "random"))
 
     # Numpy
-    seed += 1
-    numpy.random.seed(seed % 2**32)
+    numpy.random.seed(get_sub_seed(main_seed, "numpy") % 2**32)
 
     # Seed torch
-    seed += 1
-    function_to_seed_torch(seed)
+    function_to_seed_torch(get_sub_seed(main_seed, "torch"))
     return {"main seed": main_seed}
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):  # pylint: disable=unused-argument
+    """Add the reproduction instructions to the report of failing tests."""
+    outcome = yield
+    report = outcome.get_result()
+
+    if report.when != "call" or not report.failed:
+        return
+
+    main_seed = dict(item.user_properties).get("main seed")
+    if main_seed is not None:
+        report.sections.append(
+            (
+                "Seeding",
+                f"Relaunch the tests with --forcing_random_seed {main_seed} "
+                "--randomly-dont-reset-seed to reproduce. Remark that adding --randomly-seed=... "
+                "is needed when the testcase uses randoms in pytest parameters\n"
+                "Remark that potentially, any option used in the pytest call may have an impact so "
+                "in case of problem to reproduce, you may want to have a look to `make pytest` "
+                "options",
+            )
+        )
+
+
 @pytest.fixture
 def is_weekly_option(request):
     """Say if we are in --weekly configuration."""
@@ -205,7 +311,7 @@ def is_weekly_option(request):
 # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/2381
 def check_graph_input_has_no_tlu_impl(graph: CNPGraph):
     """Check that the graph's input node does not contain a TLU."""
-    succ = list(graph.graph.successors(graph.input_nodes[0]))
+    succ = graph.graph.successors(graph.input_nodes[0])
     if any(s.converted_to_table_lookup for s in succ):
         raise AssertionError(f"Graph contains a TLU on an input node: {str(graph.format())}")
 
@@ -226,11 +332,15 @@ def check_graph_has_no_input_output_tlu_impl(graph: CNPGraph):
     check_graph_output_has_no_tlu_impl(graph)
 
 
+# Matches MLIR TLU operations, such as FHE.apply_lookup_table or FHELinalg.apply_multi_lookup_table
+TLU_MLIR_RE = re.compile(r"apply_\w*lookup_table")
+
+
 # To update when the feature becomes available in CN
 # FIXME: https://github.com/zama-ai/concrete-numpy-internal/issues/1714
 def check_circuit_has_no_tlu_impl(circuit: Circuit):
     """Check a circuit has no TLU."""
-    if "apply_" in circuit.mlir and "_lookup_table" in circuit.mlir:
+    if TLU_MLIR_RE.search(circuit.mlir):
         raise AssertionError("The circuit contains at least one TLU")
 
 
@@ -277,7 +387,11 @@ def check_circuit_precision():
 def check_array_equality_impl(actual: Any, expected: Any, verbose: bool = True):
     """Assert that `actual` is equal to `expected`."""
 
-    assert numpy.array_equal(actual, expected), (
+    if numpy.array_equal(actual, expected):
+        return
+
+    # Only format the arrays when the check fails, as it can be costly for large arrays
+    raise AssertionError(
         ""
         if not verbose
         else f"""
@@ -306,7 +420,9 @@ def check_float_arrays_equal():
     """Fixture to check if two float arrays are equal with epsilon precision tolerance."""
 
     def check_float_arrays_equal_impl(a, b):
-        assert numpy.all(numpy.isclose(a, b, rtol=0, atol=0.001))
+        # Reduce the absolute differences directly instead of building a boolean array
+        abs_diff = numpy.abs(numpy.subtract(a, b, dtype=numpy.float64))
+        assert abs_diff.size == 0 or abs_diff.max() <= 0.001
 
     return check_float_arrays_equal_impl
 
@@ -318,20 +434,20 @@ def check_r2_score():
     def check_r2_score_impl(expected, actual, acceptance_score=0.99):
         expected = expected.ravel()
         actual = actual.ravel()
-        mean_expected = numpy.mean(expected)
-        deltas_expected = expected - mean_expected
         deltas_actual = actual - expected
-        r2_den = numpy.sum(deltas_expected**2)
-        r2_num = numpy.sum(deltas_actual**2)
 
         # If the values are really close, we consider the test passes
-        is_close = numpy.allclose(expected, actual, atol=1e-4, rtol=0)
-        if is_close:
+        if deltas_actual.size == 0 or numpy.abs(deltas_actual).max() <= 1e-4:
             return
 
+        deltas_expected = expected - expected.mean()
+
+        # Sums of squares are computed as dot products in order to avoid temporary arrays
+        r2_num = numpy.dot(deltas_actual, deltas_actual)
+
         # If the variance of the target values is very low, fix the max allowed for residuals
         # to a known value
-        r2_den = max(r2_den, 1e-5)
+        r2_den = max(numpy.dot(deltas_expected, deltas_expected), 1e-5)
 
         r_square = 1 - r2_num / r2_den
         assert (
@@ -352,7 +468,42 @@ def check_accuracy():
     return check_accuracy_impl
 
 
-@pytest.fixture
+@functools.lru_cache(maxsize=256)
+def get_data_generation_kind(model_class: Callable) -> str:
+    """Get the kind of data-set to generate for a model class, caching the results.
+
+    Args:
+        model_class (Callable): The Concrete ML model class to generate the data for.
+
+    Returns:
+        str: One of "classifier", "classifier_nn", "regressor", "regressor_glm", "regressor_nn" or
+            "unsupported".
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from concrete.ml.sklearn import (
+        GammaRegressor,
+        PoissonRegressor,
+        TweedieRegressor,
+        get_sklearn_neural_net_models,
+    )
+
+    is_neural_network = is_model_class_in_a_list(model_class, get_sklearn_neural_net_models())
+
+    if is_classifier_or_partial_classifier(model_class) or is_brevitas_model(model_class):
+        return "classifier_nn" if is_neural_network else "classifier"
+
+    if is_regressor_or_partial_regressor(model_class):
+        if is_model_class_in_a_list(
+            model_class, [GammaRegressor, PoissonRegressor, TweedieRegressor]
+        ):
+            return "regressor_glm"
+
+        return "regressor_nn" if is_neural_network else "regressor"
+
+    return "unsupported"
+
+
+@pytest.fixture(scope="session")
 def load_data():
     """Fixture for generating random regression or classification problem."""
 
@@ -381,40 +532,43 @@ def load_data():
         # all tests that use this fixture to be deterministic and thus reproducible.
         random_state = numpy.random.randint(0, 2**15) if random_state is None else random_state
 
+        # pylint: disable-next=import-outside-toplevel
+        from sklearn.datasets import make_classification, make_regression
+
+        model_kind = get_data_generation_kind(model_class)
+
         # If the dataset should be generated for a classification problem.
-        if is_classifier_or_partial_classifier(model_class) or is_brevitas_model(model_class):
-            generated_classifier = list(
-                make_classification(*args, **kwargs, random_state=random_state)
-            )
+        if model_kind in ("classifier", "classifier_nn"):
+            x, y, *other_outputs = make_classification(*args, **kwargs, random_state=random_state)
 
             # Cast inputs to float32 as Skorch QNNs don't handle float64 values
-            if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
-                generated_classifier[0] = generated_classifier[0].astype(numpy.float32)
+            if model_kind == "classifier_nn":
+                x = x.astype(numpy.float32, copy=False)
 
-            return tuple(generated_classifier)
+            return (x, y, *other_outputs)
 
         # If the dataset should be generated for a regression problem.
-        if is_regressor_or_partial_regressor(model_class):
-            generated_regression = list(make_regression(*args, **kwargs, random_state=random_state))
+        if model_kind in ("regressor", "regressor_glm", "regressor_nn"):
+            x, y, *other_outputs = make_regression(*args, **kwargs, random_state=random_state)
 
             # Generalized Linear Models can only handle positive target values,
-            # often strictly positive.
-            if is_model_class_in_a_list(
-                model_class, [GammaRegressor, PoissonRegressor, TweedieRegressor]
-            ):
-                generated_regression[1] = numpy.abs(generated_regression[1]) + 1
+            # often strictly positive. The target values are generated here, they can be modified
+            # in place
+            if model_kind == "regressor_glm":
+                numpy.abs(y, out=y)
+                y += 1
 
             # If the model is a neural network and if the dataset only contains a single target
             # (e.g. of shape (n,)), reshape the target array (e.g. to shape (n,1))
-            if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
-                if len(generated_regression[1].shape) == 1:
-                    generated_regression[1] = generated_regression[1].reshape(-1, 1)
+            if model_kind == "regressor_nn":
+                if len(y.shape) == 1:
+                    y = y.reshape(-1, 1)
 
                 # Cast inputs and targets to float32 as Skorch QNNs don't handle float64 values
-                generated_regression[0] = generated_regression[0].astype(numpy.float32)
-                generated_regression[1] = generated_regression[1].astype(numpy.float32)
+                x = x.astype(numpy.float32, copy=False)
+                y = y.astype(numpy.float32, copy=False)
 
-            return tuple(generated_regression)
+            return (x, y, *other_outputs)
 
         raise ValueError(
             "Model class type is unsupported. Expected a Concrete ML regressor or classifier, or "
@@ -430,7 +584,7 @@ def check_is_good_execution_for_cml_vs_circuit():
 
     def check_is_good_execution_for_cml_vs_circuit_impl(
         inputs: Union[tuple, numpy.ndarray],
-        model: Union[Callable, QuantizedModule, QuantizedTorchEstimatorMixin],
+        model: Union[Callable, "QuantizedModule", "QuantizedTorchEstimatorMixin"],
         simulate: bool,
         n_allowed_runs: int = 5,
     ):
@@ -444,6 +598,15 @@ def check_is_good_execution_for_cml_vs_circuit():
             n_allowed_runs (int): in case of FHE execution randomness can make the output slightly
                 different this allows to run the evaluation multiple times
         """
+        # pylint: disable=import-outside-toplevel
+        from concrete.ml.quantization.quantized_module import QuantizedModule
+        from concrete.ml.sklearn.base import (
+            BaseTreeEstimatorMixin,
+            QuantizedTorchEstimatorMixin,
+            SklearnLinearModelMixin,
+        )
+
+        # pylint: enable=import-outside-toplevel
 
         inputs = to_tuple(inputs)
 
@@ -455,42 +618,53 @@ def check_is_good_execution_for_cml_vs_circuit():
 
         fhe_mode = "simulate" if simulate else "execute"
 
-        for _ in range(n_allowed_runs):
-            # Check if model is QuantizedModule
-            if isinstance(model, QuantizedModule):
-                results_cnp_circuit = model.forward(*inputs, fhe=fhe_mode)
-                results_model = model.forward(*inputs, fhe="disable")
+        # Check if model is QuantizedModule
+        if isinstance(model, QuantizedModule):
+            inference_function = model.forward
+
+        else:
+            assert isinstance(
+                model,
+                (QuantizedTorchEstimatorMixin, BaseTreeEstimatorMixin, SklearnLinearModelMixin),
+            )
+
+            if model._is_a_public_cml_model:  # pylint: disable=protected-access
+                # Only check probabilities for classifiers as we only want to check that the
+                # circuit's outputs (after de-quantization) are correct. We thus want to avoid
+                # as much post-processing steps in the clear (that could lead to more flaky
+                # tests), especially since these results are tested in other tests such as the
+                # `check_subfunctions_in_fhe`
+                if is_classifier_or_partial_classifier(model):
+                    inference_function = model.predict_proba
+
+                else:
+                    inference_function = model.predict
 
             else:
-                assert isinstance(
-                    model,
-                    (QuantizedTorchEstimatorMixin, BaseTreeEstimatorMixin, SklearnLinearModelMixin),
+                raise ValueError(
+                    "numpy_function should be a built-in concrete sklearn model or "
+                    "a QuantizedModule object."
                 )
 
-                if model._is_a_public_cml_model:  # pylint: disable=protected-access
-                    # Only check probabilities for classifiers as we only want to check that the
-                    # circuit's outputs (after de-quantization) are correct. We thus want to avoid
-                    # as much post-processing steps in the clear (that could lead to more flaky
-                    # tests), especially since these results are tested in other tests such as the
-                    # `check_subfunctions_in_fhe`
-                    if is_classifier_or_partial_classifier(model):
-                        results_cnp_circuit = model.predict_proba(*inputs, fhe=fhe_mode)
-                        results_model = model.predict_proba(*inputs, fhe="disable")
+        # The clear execution is deterministic, it therefore only needs to be run once
+        results_model = inference_function(*inputs, fhe="disable")
 
-                    else:
-                        results_cnp_circuit = model.predict(*inputs, fhe=fhe_mode)
-                        results_model = model.predict(*inputs, fhe="disable")
+        # Relative part of the tolerance, using the same tolerances as numpy.isclose's default ones
+        relative_tolerance = 1e-05 * numpy.abs(results_model)
+        absolute_tolerance = 1e-08
 
-                else:
-                    raise ValueError(
-                        "numpy_function should be a built-in concrete sklearn model or "
-                        "a QuantizedModule object."
-                    )
+        for _ in range(n_allowed_runs):
+            results_cnp_circuit = inference_function(*inputs, fhe=fhe_mode)
 
             # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/2806
             # fp64 comparisons do not pass the numpy.array_equal while the quantized
             # int64 values do.
-            if numpy.isclose(results_cnp_circuit, results_model).all():
+            # For finite values, this is equivalent to numpy.isclose(...).all(). The errors are
+            # computed in a single array, updated in place
+            errors = numpy.subtract(results_cnp_circuit, results_model, dtype=numpy.float64)
+            numpy.abs(errors, out=errors)
+            errors -= relative_tolerance
+            if errors.size == 0 or errors.max() <= absolute_tolerance:
                 return
 
         raise RuntimeError(
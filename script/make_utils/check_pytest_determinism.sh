@@ -9,7 +9,8 @@ echo "Testing determinism with seed $RANDOMLY_SEED in folder ${OUTPUT_DIRECTORY}
 
 set +e
 
-RANDOMLY_SEED=$RANDOMLY_SEED TEST=tests/seeding/test_seeding.py make pytest_one_single_cpu > "${OUTPUT_DIRECTORY}/one.txt"
+# The main seed of each test is recorded in the JUnit XML report
+PYTEST_OPTIONS="--junitxml=${OUTPUT_DIRECTORY}/one.xml" RANDOMLY_SEED=$RANDOMLY_SEED TEST=tests/seeding/test_seeding.py make pytest_one_single_cpu > "${OUTPUT_DIRECTORY}/one.txt"
 
 # This would not be readable
 # SC2181: Check exit code directly with e.g. 'if mycmd;', not indirectly with $?.
@@ -21,7 +22,7 @@ then
     exit 255
 fi
 
-RANDOMLY_SEED=$RANDOMLY_SEED TEST=tests/seeding/test_seeding.py make pytest_one_single_cpu > "${OUTPUT_DIRECTORY}/two.txt"
+PYTEST_OPTIONS="--junitxml=${OUTPUT_DIRECTORY}/two.xml" RANDOMLY_SEED=$RANDOMLY_SEED TEST=tests/seeding/test_seeding.py make pytest_one_single_cpu > "${OUTPUT_DIRECTORY}/two.txt"
 
 # This would not be readable
 # SC2181: Check exit code directly with e.g. 'if mycmd;', not indirectly with $?.
@@ -37,15 +38,16 @@ set -e
 
 # Exceptions:
 #   passed in: since it is related to timings
-diff "${OUTPUT_DIRECTORY}/one.txt" "${OUTPUT_DIRECTORY}/two.txt" -I "passed in"
+#   generated xml file: since the path of the report is different
+diff "${OUTPUT_DIRECTORY}/one.txt" "${OUTPUT_DIRECTORY}/two.txt" -I "passed in" -I "generated xml file"
 echo "Successful determinism check"
 
 # Now, check --forcing_random_seed, i.e. check that one can reproduce conditions of a bug in a single file
 # and test without having to relaunch the full pytest, by just picking the right --forcing_random_seed
 
-LIST_FILES=$(grep "tests/seeding/test_seeding.py" "${OUTPUT_DIRECTORY}/one.txt")
+LIST_FILES=$(grep -o "tests/seeding/test_seeding.py::[^ ]*" "${OUTPUT_DIRECTORY}/one.txt")
 LIST_SEED=()
-while IFS='' read -r line; do LIST_SEED+=("$line"); done < <(grep "forcing_random_seed" "${OUTPUT_DIRECTORY}/one.txt" | sed -e "s@Relaunch the tests with --forcing_random_seed @@" | sed -e "s@ --randomly-dont-reset-seed to reproduce. Remark that adding --randomly-seed=... is needed when the testcase uses randoms in pytest parameters@@" )
+while IFS='' read -r line; do LIST_SEED+=("$line"); done < <(grep -o 'name="main seed" value="[0-9]*"' "${OUTPUT_DIRECTORY}/one.xml" | sed -e 's@name="main seed" value="@@' | sed -e 's@"@@' )
 
 WHICH=0
 echo "" > "${OUTPUT_DIRECTORY}/three.txt"
@@ -70,7 +72,7 @@ do
 done
 
 # Clean a bit one.txt
-sed -n -e '/collecting/,$p' "${OUTPUT_DIRECTORY}/one.txt" | grep -v collecting | grep -v "collected" | grep -v "passed in" | grep -v "PASSED" | grep -v "Leaving directory" > "${OUTPUT_DIRECTORY}/one.modified.txt"
+sed -n -e '/collecting/,$p' "${OUTPUT_DIRECTORY}/one.txt" | grep -v collecting | grep -v "collected" | grep -v "passed in" | grep -v "PASSED" | grep -v "Leaving directory" | grep -v "generated xml file" > "${OUTPUT_DIRECTORY}/one.modified.txt"
 
 echo ""
 echo "diff:"
@@ -740,28 +740,30 @@ class TinyQATCNN(nn.Module):
         # Freeze normalization layers
         self.eval()
 
-        all_y_pred = numpy.zeros((len(test_loader)), dtype=numpy.int64)
-        all_targets = numpy.zeros((len(test_loader)), dtype=numpy.int64)
+        # The arrays are sized with the number of examples, as batches can have several ones
+        all_y_pred = numpy.zeros((len(test_loader.dataset)), dtype=numpy.int64)
+        all_targets = numpy.zeros((len(test_loader.dataset)), dtype=numpy.int64)
 
-        # Iterate over the batches
+        # Iterate over the batches, without tracking the gradients as the network is only evaluated
         idx = 0
-        for data, target in test_loader:
-            # Accumulate the ground truth labels
-            endidx = idx + target.shape[0]
-            all_targets[idx:endidx] = target.numpy()
-
-            # Run forward and get the raw predictions first
-            raw_pred = self(data).detach().numpy()
-
-            # Get the predicted class id, handle NaNs
-            if numpy.any(numpy.isnan(raw_pred)):
-                output = -1  # pragma: no cover
-            else:
-                output = raw_pred.argmax(1)
+        with torch.no_grad():
+            for data, target in test_loader:
+                # Accumulate the ground truth labels
+                endidx = idx + target.shape[0]
+                all_targets[idx:endidx] = target.numpy()
+
+                # Run forward and get the raw predictions first
+                raw_pred = self(data).numpy()
+
+                # Get the predicted class id, handle NaNs
+                if numpy.any(numpy.isnan(raw_pred)):
+                    output = -1  # pragma: no cover
+                else:
+                    output = raw_pred.argmax(1)
 
-            all_y_pred[idx:endidx] = output
+                all_y_pred[idx:endidx] = output
 
-            idx += target.shape[0]
+                idx += target.shape[0]
 
         # Print out the accuracy as a percentage
         n_correct = numpy.sum(all_targets == all_y_pred)
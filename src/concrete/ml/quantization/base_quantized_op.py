@@ -1,14 +1,15 @@
 """Base Quantized Op class that implements quantization for a float numpy op."""
 
 from copy import deepcopy
-from inspect import Parameter, _empty, signature
+from functools import lru_cache
+from inspect import Parameter, Signature, _empty, signature
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union, cast
 
 import numpy
 
 from concrete import fhe
 
-from ..common.debugging import assert_false, assert_true
+from ..common.debugging import assert_not_reached, assert_true
 from ..common.utils import compute_bits_precision
 from ..onnx.onnx_utils import ONNX_OPS_TO_NUMPY_IMPL
 from ..onnx.ops_impl import ONNXMixedFunction, RawOpOutput
@@ -35,6 +36,22 @@ ONNX_OPS_TO_QUANTIZED_IMPL: Dict[str, Type["QuantizedOp"]] = {}
 DEFAULT_MODEL_BITS = 5
 
 
+@lru_cache(maxsize=None)
+def _get_impl_signature(impl_function: Callable) -> Signature:
+    """Get the signature of a numpy implementation of an ONNX op.
+
+    Subclasses of a quantized op share its implementation and each class is populated when it is
+    created, the signature is thus only inspected once per implementation.
+
+    Args:
+        impl_function (Callable): the numpy implementation
+
+    Returns:
+        Signature: the signature of the implementation
+    """
+    return signature(impl_function)
+
+
 class QuantizedOp:
     """Base class for quantized ONNX ops implemented in numpy.
 
@@ -77,6 +94,7 @@ class QuantizedOp:
     _params_that_are_onnx_var_inputs: Set[str] = set()
     _params_that_are_required_onnx_inputs: Set[str] = set()
     _has_attr: bool
+    _impl_func: Callable[..., Tuple[numpy.ndarray, ...]]
     _inputs_not_quantized: Set[str] = set()
     quantize_inputs_with_model_outputs_precision: bool = False
 
@@ -163,6 +181,14 @@ class QuantizedOp:
             self._params_name_to_input_idx[input_name]: constant_value
             for input_name, constant_value in constant_inputs_per_name.items()
         }
+
+        # The constants are fixed, so are the input slots that the variable inputs will fill
+        self._input_fill_slots = [
+            input_idx
+            for input_idx in range(len(self._params_that_are_onnx_inputs))
+            if input_idx not in self.constant_inputs
+        ]
+
         unknown_attrs = attrs.keys() - self._authorized_attr_names
         assert_true(
             len(unknown_attrs) == 0,
@@ -174,7 +200,19 @@ class QuantizedOp:
             ),
         )
 
-        self.attrs = dict(self._default_attrs, **deepcopy(attrs))
+        # Attributes are mostly scalars, only copy the mutable containers instead of deep-copying
+        # the whole dictionary
+        self.attrs = dict(
+            self._default_attrs,
+            **{
+                attr_name: (
+                    attr_value.copy()
+                    if isinstance(attr_value, (list, dict, numpy.ndarray))
+                    else attr_value
+                )
+                for attr_name, attr_value in attrs.items()
+            },
+        )
 
         # Only use QAT for layers that need it (that mix encrypted values: conv, dense, add, etc...)
         if self.can_fuse():
@@ -221,6 +259,11 @@ class QuantizedOp:
         cls._populate_op_input_infos()
         cls._has_attr = len(cls._authorized_attr_names) > 0
 
+        # Resolve the underlying numpy function once for all, instead of at each call. It is stored
+        # as a static method as self.impl would otherwise call impl with self as first parameter
+        impl_func = cls.impl.function if isinstance(cls.impl, ONNXMixedFunction) else cls.impl
+        cls._impl_func = staticmethod(impl_func)  # type: ignore
+
     def __call__(self, *q_inputs: ONNXOpInputOutputType) -> ONNXOpInputOutputType:
         """Process the forward pass of the quantized op according to the implementation.
 
@@ -240,11 +283,11 @@ class QuantizedOp:
         # for mypy
         assert cls.impl is not None
         if isinstance(cls.impl, ONNXMixedFunction):
-            impl_signature = signature(cls.impl.function)
+            impl_signature = _get_impl_signature(cls.impl.function)
             cls._inputs_not_quantized = cls.impl.non_quant_params
             cls.produces_raw_output = cls.impl.output_is_raw
         else:
-            impl_signature = signature(cls.impl)
+            impl_signature = _get_impl_signature(cls.impl)
         impl_params = impl_signature.parameters
         cls._params_name_to_input_idx = {val: index for index, val in enumerate(impl_params)}
         cls._input_idx_to_params_name = dict(enumerate(impl_params))
@@ -388,11 +431,12 @@ class QuantizedOp:
         quant_opts = QuantizationOptions(self.input_quant_opts.n_bits)
         quant_opts.copy_opts(self.input_quant_opts)
 
-        assert_false(
-            self.can_fuse(),
-            f"The {self.__class__.__name__} operation is attempting "
-            "to quantize its inputs but is marked as fusable (can_fuse() return True). ",
-        )
+        # Checks executed at each call only format their error message if they fail
+        if self.can_fuse():  # pragma: no cover
+            assert_not_reached(
+                f"The {self.__class__.__name__} operation is attempting "
+                "to quantize its inputs but is marked as fusable (can_fuse() return True). ",
+            )
 
         # Now we quantize the input. For ops that require quantized inputs (which
         # call this function with quantize_actual_values==True), this
@@ -472,13 +516,13 @@ class QuantizedOp:
             if not is_param_variadic
             else True
         )
-        assert_true(
-            condition_inputs,
-            f"This operator has {num_onnx_inputs} ONNX inputs, and {num_provided_constants} "
-            "constants were already provided when instantiating the class. "
-            f"Got a call with {num_inputs} inputs and constants while the call expects between "
-            f"{num_required_onnx_inputs} and {num_onnx_inputs} inputs and constants.",
-        )
+        if not condition_inputs:  # pragma: no cover
+            assert_not_reached(
+                f"This operator has {num_onnx_inputs} ONNX inputs, and {num_provided_constants} "
+                "constants were already provided when instantiating the class. "
+                f"Got a call with {num_inputs} inputs and constants while the call expects "
+                f"between {num_required_onnx_inputs} and {num_onnx_inputs} inputs and constants.",
+            )
 
         prepared_inputs = self._prepare_constants(
             num_inputs if is_param_variadic else num_onnx_inputs,
@@ -491,11 +535,14 @@ class QuantizedOp:
         # If quantized values are requested, we quantized the float32 values contained in the
         # QuantizedArrays, else we return the float32 values directly.
 
-        curr_input_fill_idx = 0
-        for input_idx, input_ in enumerate(inputs):
-            while prepared_inputs[curr_input_fill_idx] is not None:
-                curr_input_fill_idx += 1
+        # Variable inputs fill, in order, the slots that are not taken by constants
+        input_fill_slots = (
+            [input_idx for input_idx, value in enumerate(prepared_inputs) if value is None]
+            if is_param_variadic
+            else self._input_fill_slots
+        )
 
+        for input_idx, (curr_input_fill_idx, input_) in enumerate(zip(input_fill_slots, inputs)):
             # This is an integer scalar (e.g. tensor shape). This is not an encrypted
             # value, it is not traced
             is_clear_value = isinstance(input_, RawOpOutput)
@@ -531,8 +578,6 @@ class QuantizedOp:
                 input_ = cast(QuantizedArray, input_)
                 prepared_inputs[curr_input_fill_idx] = input_.values
 
-            curr_input_fill_idx += 1
-
         if self.debug_value_tracker is not None:
             # For mypy
             assert self.debug_value_tracker is not None
@@ -584,11 +629,11 @@ class QuantizedOp:
             QuantizedArray: Quantized output.
         """
 
-        assert_true(
-            self.output_quant_params is not None,
-            f"output quantization params was None for class {self.__class__.__name__}, "
-            "did you forget to call calibrate with sample data?",
-        )
+        if self.output_quant_params is None:  # pragma: no cover
+            assert_not_reached(
+                f"output quantization params was None for class {self.__class__.__name__}, "
+                "did you forget to call calibrate with sample data?",
+            )
 
         return QuantizedArray(
             self.n_bits,
@@ -612,24 +657,18 @@ class QuantizedOp:
             numpy.ndarray: return value of self.impl
         """
 
-        # Continuation of mypy bug
-        assert self.impl is not None
-        # mypy is not happy with __func__
-        # self.impl will call impl with self as first parameter, so get the underlying __func__
-        if isinstance(self.impl, ONNXMixedFunction):
-            impl_func = self.impl.function
-        else:
-            impl_func = self.impl.__func__  # type: ignore
-        outputs = impl_func(*inputs) if not self._has_attr else impl_func(*inputs, **attrs)
-        assert_true(
-            isinstance(outputs, tuple),
-            f"The output of {impl_func.__name__} needs to be a tuple. Got {outputs}",
-        )
+        impl_func = self._impl_func
+        outputs = impl_func(*inputs, **attrs) if self._has_attr else impl_func(*inputs)
+        if not isinstance(outputs, tuple):  # pragma: no cover
+            assert_not_reached(
+                f"The output of {impl_func.__name__} needs to be a tuple. Got {outputs}"
+            )
+
         num_outputs = len(outputs)
-        assert_true(
-            (num_outputs) == 1,
-            f"Currently only single output ops are supported, got {num_outputs} outputs.",
-        )
+        if num_outputs != 1:  # pragma: no cover
+            assert_not_reached(
+                f"Currently only single output ops are supported, got {num_outputs} outputs."
+            )
 
         return outputs[0]
 
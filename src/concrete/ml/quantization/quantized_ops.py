@@ -5,9 +5,10 @@
 # This file is too long and should be splitted
 # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/1018
 
-from typing import Any, Dict, Optional, Sequence, Set, Union
+from typing import Any, Dict, Optional, Sequence, Set, Tuple, Union
 
 import numpy
+from concrete import fhe
 from concrete.fhe import conv as cnp_conv
 from concrete.fhe import maxpool as cnp_maxpool
 from concrete.fhe import tag
@@ -49,19 +50,45 @@ def _check_op_input_zero_point(zero_point: Any, op_name: Optional[str]):
     )
 
 
-class QuantizedSigmoid(QuantizedOp):
+class _QuantizedUnaryOp(QuantizedOp, is_utility=True):
+    """Base class for quantized element-wise ops with a single encrypted input.
+
+    These ops are usually called with a single quantized input and no constants. In that case,
+    the float values of the input are passed directly to the numpy implementation, without
+    going through the generic preparation of the inputs.
+    """
+
+    def q_impl(
+        self,
+        *q_inputs: ONNXOpInputOutputType,
+        **attrs,
+    ) -> ONNXOpInputOutputType:
+
+        # Constants, raw inputs and value tracking are handled by the generic implementation
+        if (
+            len(q_inputs) != 1
+            or len(self.constant_inputs) > 0
+            or self.debug_value_tracker is not None
+            or not isinstance(q_inputs[0], QuantizedArray)
+        ):
+            return super().q_impl(*q_inputs, **attrs)
+
+        return self.prepare_output(self.call_impl(q_inputs[0].values, **attrs))
+
+
+class QuantizedSigmoid(_QuantizedUnaryOp):
     """Quantized sigmoid op."""
 
     _impl_for_op_named: str = "Sigmoid"
 
 
-class QuantizedHardSigmoid(QuantizedOp):
+class QuantizedHardSigmoid(_QuantizedUnaryOp):
     """Quantized HardSigmoid op."""
 
     _impl_for_op_named: str = "HardSigmoid"
 
 
-class QuantizedRelu(QuantizedOp):
+class QuantizedRelu(_QuantizedUnaryOp):
     """Quantized Relu op."""
 
     _impl_for_op_named: str = "Relu"
@@ -73,31 +100,31 @@ class QuantizedPRelu(QuantizedOp):
     _impl_for_op_named: str = "PRelu"
 
 
-class QuantizedLeakyRelu(QuantizedOp):
+class QuantizedLeakyRelu(_QuantizedUnaryOp):
     """Quantized LeakyRelu op."""
 
     _impl_for_op_named: str = "LeakyRelu"
 
 
-class QuantizedHardSwish(QuantizedOp):
+class QuantizedHardSwish(_QuantizedUnaryOp):
     """Quantized Hardswish op."""
 
     _impl_for_op_named: str = "HardSwish"
 
 
-class QuantizedElu(QuantizedOp):
+class QuantizedElu(_QuantizedUnaryOp):
     """Quantized Elu op."""
 
     _impl_for_op_named: str = "Elu"
 
 
-class QuantizedSelu(QuantizedOp):
+class QuantizedSelu(_QuantizedUnaryOp):
     """Quantized Selu op."""
 
     _impl_for_op_named: str = "Selu"
 
 
-class QuantizedCelu(QuantizedOp):
+class QuantizedCelu(_QuantizedUnaryOp):
     """Quantized Celu op."""
 
     _impl_for_op_named: str = "Celu"
@@ -163,6 +190,141 @@ class QuantizedGemm(QuantizedMixingOp):
             f"{self._impl_for_op_named} if weights are provided as the 'b' constant input.",
         )
 
+        # Cache for the terms of the computation that do not depend on the input values, along
+        # with the parameters they were computed for
+        self._constant_terms_cache: Optional[Tuple[Tuple[Any, ...], Tuple[Any, ...]]] = None
+
+        # Float copies of the integer weights used by the clear matmul, transposed if needed and
+        # stored contiguously, along with their largest absolute value, for both possible
+        # transpositions of the weights. They are kept in addition to the weights held by the
+        # constant inputs
+        self._float_weights: Dict[bool, Tuple[Optional[numpy.ndarray], int]] = {}
+
+        # The sums of the integer weights over the input dimension only depend on the constant
+        # weights, compute them right away for the transposition given in the attributes
+        self._weights_sums: Dict[bool, numpy.ndarray] = {}
+
+        q_weights = self.constant_inputs[1]
+        if isinstance(q_weights, QuantizedArray) and q_weights.qvalues is not None:
+            transpose_w = self.attrs.get("transB", False)
+            self._weights_sums[transpose_w] = numpy.sum(
+                numpy.transpose(q_weights.qvalues) if transpose_w else q_weights.qvalues,
+                axis=0,
+                keepdims=True,
+            )
+
+    def _get_constant_terms(
+        self,
+        q_input: QuantizedArray,
+        q_weights: QuantizedArray,
+        weights_q_values: numpy.ndarray,
+        transpose_w: bool,
+    ) -> Tuple[Any, ...]:
+        """Get the terms of the Gemm computation that do not depend on the input values.
+
+        These terms only depend on the constant weights and on the input quantization parameters.
+        They are thus only re-computed when these parameters change, for example between
+        calibration and inference.
+
+        Args:
+            q_input (QuantizedArray): the quantized input of the op
+            q_weights (QuantizedArray): the quantized weights of the op
+            weights_q_values (numpy.ndarray): the integer weights, transposed if needed
+            transpose_w (bool): whether the weights are transposed
+
+        Returns:
+            Tuple[Any, ...]: the zero-point offset to add to the integer matmul, i.e. the product
+                of the zero-points minus the sum of the weights multiplied by the input zero-point,
+                and the scale of the integer matmul
+        """
+        cache_key = (transpose_w, q_input.quantizer.scale, q_input.quantizer.zero_point)
+
+        if self._constant_terms_cache is not None:
+            cached_key, cached_terms = self._constant_terms_cache
+            if cached_key[0] == transpose_w and all(
+                numpy.array_equal(cached_value, value)
+                for cached_value, value in zip(cached_key[1:], cache_key[1:])
+            ):
+                return cached_terms
+
+        p = weights_q_values.shape[0]
+
+        # The sums of the weights are computed at construction, from the constant weights
+        assert transpose_w in self._weights_sums
+
+        # sum_weights is a constant
+        sum_weights = q_input.quantizer.zero_point * self._weights_sums[transpose_w]
+
+        final_term = p * q_input.quantizer.zero_point * q_weights.quantizer.zero_point
+
+        # Note that here we do not rescale to the output_scale and we do not add a zero-point
+        # Any following Gemm/MatMul/Conv layers will do the rescaling (during requantization)
+        # by calling _prepare_inputs_with_constants(...quantize_real_values=True)
+        m_matmul = q_input.quantizer.scale * q_weights.quantizer.scale
+
+        constant_terms = (final_term - sum_weights, m_matmul)
+        self._constant_terms_cache = (cache_key, constant_terms)
+
+        return constant_terms
+
+    def _integer_matmul(
+        self,
+        input_q_values: Union[numpy.ndarray, fhe.tracing.Tracer],
+        weights_q_values: numpy.ndarray,
+        transpose_w: bool,
+    ) -> Union[numpy.ndarray, fhe.tracing.Tracer]:
+        """Compute the integer matmul between the inputs and the weights.
+
+        Numpy does not use BLAS for integer matmuls. When executing in the clear, the matmul is
+        thus done on float64 values whenever the largest possible accumulated value is exactly
+        representable as a float64, i.e. is below 2**53. In that case, every partial sum is an
+        exactly represented integer, whatever the summation order, so the result is exact. The
+        float64 weights are only computed once and are then kept for as long as the op exists: in
+        the clear, each Gemm or MatMul op thus holds an extra float64 copy of its weights, which
+        avoids converting them at every call.
+
+        Args:
+            input_q_values (Union[numpy.ndarray, fhe.tracing.Tracer]): the integer inputs
+            weights_q_values (numpy.ndarray): the integer weights, transposed if needed
+            transpose_w (bool): whether the weights are transposed
+
+        Returns:
+            Union[numpy.ndarray, fhe.tracing.Tracer]: the result of the matmul
+        """
+
+        # Concrete handles the bit-widths of the traced values itself
+        if (
+            isinstance(input_q_values, fhe.tracing.Tracer)
+            or input_q_values.size == 0
+            or weights_q_values.size == 0
+            or not numpy.issubdtype(input_q_values.dtype, numpy.integer)
+            or not numpy.issubdtype(weights_q_values.dtype, numpy.integer)
+        ):
+            return input_q_values @ weights_q_values
+
+        if transpose_w not in self._float_weights:
+            weights_abs_max = int(numpy.abs(weights_q_values).max())
+            self._float_weights[transpose_w] = (
+                (
+                    numpy.ascontiguousarray(weights_q_values, dtype=numpy.float64)
+                    if weights_abs_max < 2**53
+                    else None
+                ),
+                weights_abs_max,
+            )
+
+        float_weights, weights_abs_max = self._float_weights[transpose_w]
+
+        max_accumulator = (
+            int(input_q_values.shape[-1]) * int(numpy.abs(input_q_values).max()) * weights_abs_max
+        )
+
+        if float_weights is None or max_accumulator >= 2**53:
+            return input_q_values @ weights_q_values
+
+        matmul = input_q_values.astype(numpy.float64) @ float_weights
+        return matmul.astype(numpy.int64)
+
     def q_impl(
         self,
         *q_inputs: ONNXOpInputOutputType,
@@ -196,6 +358,7 @@ class QuantizedGemm(QuantizedMixingOp):
             input_q_values = (
                 numpy.transpose(q_input.qvalues) if transpose_inputs else q_input.qvalues
             )
+
         weights_q_values = numpy.transpose(q_weights.qvalues) if transpose_w else q_weights.qvalues
 
         # For mypy
@@ -216,11 +379,9 @@ class QuantizedGemm(QuantizedMixingOp):
         # Here we follow Eq.7 in https://arxiv.org/abs/1712.05877 to split the core computation
         # from the zero points and scales.
 
-        p = weights_q_values.shape[0]
-
         # Core matmul operation in full integers with a shape change (INTEGERS)
         with tag(self.op_instance_name + ".matmul"):
-            matmul = input_q_values @ weights_q_values
+            matmul = self._integer_matmul(input_q_values, weights_q_values, transpose_w)
 
         # If the weights have symmetric quantization, their zero point will be 0
         # The following check avoids the computation of the sum of the inputs, which may have
@@ -228,13 +389,13 @@ class QuantizedGemm(QuantizedMixingOp):
         if q_weights.quantizer.zero_point != 0:
             # Sum operation in full integers resulting in large integers (INTEGERS)
             with tag(self.op_instance_name + ".matmul_inputsum"):
-                sum_input = -q_weights.quantizer.zero_point * numpy.sum(
+                sum_input = q_weights.quantizer.zero_point * numpy.sum(
                     input_q_values, axis=1, keepdims=True
                 )
 
             with tag(self.op_instance_name + ".matmul_add_inputsum"):
                 # Last part that has to be done in integer
-                numpy_q_out = matmul + sum_input
+                numpy_q_out = matmul - sum_input
         else:
             numpy_q_out = matmul
 
@@ -242,23 +403,15 @@ class QuantizedGemm(QuantizedMixingOp):
             # pylint: disable-next=unsubscriptable-object
             self.debug_value_tracker[self.op_instance_name]["output"] = numpy_q_out  # type: ignore
 
-        # sum_weights is a constant
-        sum_weights = q_input.quantizer.zero_point * numpy.sum(
-            weights_q_values, axis=0, keepdims=True
+        zero_point_offset, m_matmul = self._get_constant_terms(
+            q_input, q_weights, weights_q_values, transpose_w
         )
 
-        final_term = p * q_input.quantizer.zero_point * q_weights.quantizer.zero_point
-
-        # Note that here we do not rescale to the output_scale and we do not add a zero-point
-        # Any following Gemm/MatMul/Conv layers will do the rescaling (during requantization)
-        # by calling _prepare_inputs_with_constants(...quantize_real_values=True)
-        m_matmul = q_input.quantizer.scale * q_weights.quantizer.scale
-
         # If this operation's result are network outputs, return
         # directly the integer values and a appropriate quantization parameters that
         # allow direct in-the-clear dequantization, including the bias
         if self.produces_graph_output:
-            out_zp: Union[int, numpy.ndarray] = sum_weights - final_term
+            out_zp: Union[int, numpy.ndarray] = -zero_point_offset
             if q_bias is not None:
                 # Make mypy happy
                 assert q_bias is not None
@@ -276,13 +429,30 @@ class QuantizedGemm(QuantizedMixingOp):
 
         # Quantization scales and zero points (FLOATS involved)
         # This is going to be compiled with a PBS (along with the following activation function)
-        numpy_q_out = numpy_q_out.astype(numpy.float64) + final_term - sum_weights
+        numpy_q_out = numpy_q_out.astype(numpy.float64)
+
+        # In the clear, the float array created above can be updated in place as long as the
+        # broadcasting of the constants does not change its shape
+        if not isinstance(numpy_q_out, fhe.tracing.Tracer) and (
+            numpy.broadcast(
+                numpy_q_out, zero_point_offset, m_matmul, 0 if q_bias is None else q_bias
+            ).shape
+            == numpy_q_out.shape
+        ):
+            numpy_q_out += zero_point_offset
+            numpy_q_out *= m_matmul
 
-        numpy_q_out = m_matmul * numpy_q_out
+            if q_bias is not None:
+                numpy_q_out += q_bias
 
-        if q_bias is not None:
-            # The bias is handled as a float and will be fused
-            numpy_q_out = numpy_q_out + q_bias
+        else:
+            numpy_q_out = numpy_q_out + zero_point_offset
+
+            numpy_q_out = m_matmul * numpy_q_out
+
+            if q_bias is not None:
+                # The bias is handled as a float and will be fused
+                numpy_q_out = numpy_q_out + q_bias
 
         # Return the float values, so that Concrete can fuse any following float operations
         # We also keep track of the scaling factor and zero-point, since these will be
@@ -423,19 +593,19 @@ class QuantizedAdd(QuantizedOp):
         return len(self._int_input_names) == 1
 
 
-class QuantizedTanh(QuantizedOp):
+class QuantizedTanh(_QuantizedUnaryOp):
     """Quantized Tanh op."""
 
     _impl_for_op_named: str = "Tanh"
 
 
-class QuantizedSoftplus(QuantizedOp):
+class QuantizedSoftplus(_QuantizedUnaryOp):
     """Quantized Softplus op."""
 
     _impl_for_op_named: str = "Softplus"
 
 
-class QuantizedExp(QuantizedOp):
+class QuantizedExp(_QuantizedUnaryOp):
     """Quantized Exp op."""
 
     _impl_for_op_named: str = "Exp"
@@ -8,7 +8,7 @@ from typing import IO, Any, Dict, Optional, Union, get_type_hints
 
 import numpy
 
-from ..common.debugging import assert_true
+from ..common.debugging import assert_not_reached, assert_true
 from ..common.serialization.encoder import CustomEncoder
 
 STABILITY_CONST = 10**-6
@@ -690,7 +690,22 @@ class UniformQuantizer(UniformQuantizationParameters, QuantizationOptions, MinMa
         assert self.offset is not None
         assert self.scale is not None
 
-        qvalues = numpy.rint(values / self.scale + self.zero_point)
+        qvalues = values / self.scale
+
+        # When executing in the clear, the division above produces a new array that can be
+        # updated in place, which avoids allocating an intermediate array at each step.
+        # Traced values (Concrete compilation) go through the regular numpy functions
+        in_place = (
+            isinstance(qvalues, numpy.ndarray)
+            and qvalues.dtype == numpy.float64
+            and numpy.ndim(self.zero_point) == 0
+        )
+
+        if in_place:
+            qvalues += self.zero_point
+            numpy.rint(qvalues, out=qvalues)
+        else:
+            qvalues = numpy.rint(qvalues + self.zero_point)
 
         # Clipping can be performed for PTQ and for precomputed (for now only Brevitas) QAT
         # (where quantizer parameters are available in ONNX layers).
@@ -708,7 +723,12 @@ class UniformQuantizer(UniformQuantizationParameters, QuantizationOptions, MinMa
             if self.is_narrow:
                 min_value += 1
 
-            qvalues = qvalues.clip(min_value, 2 ** (self.n_bits) - 1 - self.offset)
+            max_value = 2 ** (self.n_bits) - 1 - self.offset
+
+            if in_place:
+                qvalues.clip(min_value, max_value, out=qvalues)
+            else:
+                qvalues = qvalues.clip(min_value, max_value)
 
         return qvalues.astype(numpy.int64)
 
@@ -726,13 +746,16 @@ class UniformQuantizer(UniformQuantizationParameters, QuantizationOptions, MinMa
         assert self.zero_point is not None
         assert self.scale is not None
 
-        assert_true(
+        # This is executed at each call, only format the error message if the check fails
+        if not (  # pragma: no cover
             isinstance(self.scale, (numpy.floating, float))
-            or (isinstance(self.scale, numpy.ndarray) and self.scale.dtype is numpy.float64),
-            "Scale is a of type "
-            + type(self.scale).__name__
-            + ((" " + str(self.scale.dtype)) if isinstance(self.scale, numpy.ndarray) else ""),
-        )
+            or (isinstance(self.scale, numpy.ndarray) and self.scale.dtype is numpy.float64)
+        ):
+            assert_not_reached(
+                "Scale is a of type "
+                + type(self.scale).__name__
+                + ((" " + str(self.scale.dtype)) if isinstance(self.scale, numpy.ndarray) else ""),
+            )
 
         ans = self.scale * (qvalues - numpy.asarray(self.zero_point, dtype=numpy.float64))
 
@@ -899,15 +922,19 @@ class QuantizedArray:
             params (Optional[UniformQuantizationParameters]): Quantization parameters set
                 (scale, zero-point)
         """
+        # Quantized arrays are created by every op call, the error messages of the checks below
+        # are only formatted if the checks fail
         if value_is_float:
-            if isinstance(values, numpy.ndarray):
-                assert_true(
-                    numpy.issubdtype(values.dtype, numpy.floating),
+            if isinstance(values, numpy.ndarray) and not numpy.issubdtype(  # pragma: no cover
+                values.dtype, numpy.floating
+            ):
+                assert_not_reached(
                     "Values must be float if value_is_float is set to True, "
                     f"got {values.dtype}: {values}",
                 )
 
-            self.values = deepcopy(values) if isinstance(values, numpy.ndarray) else values
+            # Values are checked to be numerical arrays, a plain copy is equivalent to a deep copy
+            self.values = values.copy() if isinstance(values, numpy.ndarray) else values
 
             # If no stats are provided, compute them.
             # Note that this cannot be done during tracing
@@ -925,20 +952,23 @@ class QuantizedArray:
             # Once the quantizer is ready, quantize the float values provided
             self.quant()
         else:
-            assert_true(
-                params is not None,
-                f"When initializing {self.__class__.__name__} with value_is_float == "
-                "False, the scale and zero_point parameters are required.",
-            )
-            if isinstance(values, numpy.ndarray):
-                assert_true(
-                    numpy.issubdtype(values.dtype, numpy.integer)
-                    or numpy.issubdtype(values.dtype, numpy.unsignedinteger),
+            if params is None:  # pragma: no cover
+                assert_not_reached(
+                    f"When initializing {self.__class__.__name__} with value_is_float == "
+                    "False, the scale and zero_point parameters are required.",
+                )
+
+            if isinstance(values, numpy.ndarray) and not (  # pragma: no cover
+                numpy.issubdtype(values.dtype, numpy.integer)
+                or numpy.issubdtype(values.dtype, numpy.unsignedinteger)
+            ):
+                assert_not_reached(
                     f"Can't create a QuantizedArray from {values.dtype} values "
                     "when int/uint was required",
                 )
 
-            self.qvalues = deepcopy(values) if isinstance(values, numpy.ndarray) else values
+            # Values are checked to be integer arrays, a plain copy is equivalent to a deep copy
+            self.qvalues = values.copy() if isinstance(values, numpy.ndarray) else values
 
             # Populate self.values
             self.dequant()
@@ -482,6 +482,43 @@ def test_all_gemm_ops(
     check_array_equality(actual_mm_output, actual_gemm_output)
 
 
+@pytest.mark.parametrize("n_bits, n_features", [pytest.param(8, 64), pytest.param(26, 64)])
+@pytest.mark.parametrize("is_signed", IS_SIGNED)
+def test_gemm_integer_matmul(
+    n_bits: int,
+    n_features: int,
+    is_signed: bool,
+    check_r2_score: Callable,
+    check_array_equality: Callable,
+):
+    """Test that the integer matmul of gemm ops is exact, whatever the accumulator bit-width."""
+
+    inputs = numpy.random.uniform(-1, 1, size=(100, n_features))
+    weights = numpy.random.uniform(-1, 1, size=(n_features, 10))
+
+    q_inputs = QuantizedArray(n_bits, inputs)
+    q_weights = QuantizedArray(n_bits, weights, is_signed=is_signed)
+
+    q_gemm = QuantizedGemm(
+        n_bits,
+        OP_DEBUG_NAME + "QuantizedGemm",
+        int_input_names={"0"},
+        constant_inputs={"b": q_weights},
+    )
+
+    # With 26 bits, the accumulated values do not fit in a float64 mantissa, the matmul must then
+    # fall back to int64
+    matmul = q_gemm._integer_matmul(  # pylint: disable=protected-access
+        q_inputs.qvalues, q_weights.qvalues, False
+    )
+    check_array_equality(matmul, q_inputs.qvalues @ q_weights.qvalues)
+
+    expected_gemm_outputs = q_gemm.calibrate(inputs)
+    actual_gemm_output = q_gemm(q_inputs).dequant()
+
+    check_r2_score(expected_gemm_outputs, actual_gemm_output)
+
+
 @pytest.mark.parametrize("n_bits", [1, 2, 3, 4, 5, 6])
 @pytest.mark.parametrize("x", [numpy.random.randn(100)])
 def test_identity_op(x, n_bits):
@@ -28,22 +28,20 @@ More information in https://github.com/zama-ai/concrete-ml-internal/issues/2682
 """
 
 # pylint: disable=too-many-lines
+import hashlib
+import io
 import json
-import tempfile
 import warnings
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy
-import pandas
 import pytest
-import torch
 from sklearn.decomposition import PCA
 from sklearn.exceptions import ConvergenceWarning
 from sklearn.metrics import make_scorer, matthews_corrcoef, mean_squared_error
 from sklearn.model_selection import GridSearchCV
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
-from torch import nn
 
 from concrete.ml.common.serialization.dumpers import dump, dumps
 from concrete.ml.common.serialization.loaders import load, loads
@@ -56,6 +54,7 @@ from concrete.ml.common.utils import (
 )
 from concrete.ml.pytest.utils import (
     _classifiers_and_datasets,
+    get_random_extract_of_sklearn_models_and_datasets,
     instantiate_model_generic,
     sklearn_models_and_datasets,
 )
@@ -103,19 +102,125 @@ N_BITS_LINEAR_MODEL_CRYPTO_PARAMETERS = 11
 N_BITS_REGULAR_BUILDS = [6, 26]
 N_BITS_WEEKLY_ONLY_BUILDS = [2, 8, 16]
 
+# n_bits used by the tests that never compile the models. Without compilation, the bit-widths only
+# tested in weekly builds do not bring more coverage than the regular ones
+N_BITS_NO_COMPILATION_TESTS = N_BITS_REGULAR_BUILDS
+
+# Sub-functions are checked in FHE for all n_bits with linear models, but only for the lowest
+# bit-width used for predict correctness tests in regular builds with other models
+N_BITS_SUBFUNCTIONS_IN_FHE_TESTS = min(
+    n for n in N_BITS_REGULAR_BUILDS if n >= N_BITS_THRESHOLD_FOR_PREDICT_CORRECTNESS_TESTS
+)
+
+# n_bits parametrizing the tests, computed once when loading the module
+N_BITS_ALL_BUILDS = tuple(N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS)
+N_BITS_SKLEARN_EQUIVALENCE_TESTS = tuple(
+    n for n in N_BITS_ALL_BUILDS if n >= N_BITS_THRESHOLD_FOR_SKLEARN_EQUIVALENCE_TESTS
+)
+N_BITS_SKLEARN_CORRECTNESS_TESTS = tuple(
+    n for n in N_BITS_ALL_BUILDS if n >= N_BITS_THRESHOLD_FOR_SKLEARN_CORRECTNESS_TESTS
+)
+N_BITS_PREDICT_CORRECTNESS_TESTS = tuple(
+    n for n in N_BITS_ALL_BUILDS if n >= N_BITS_THRESHOLD_FOR_PREDICT_CORRECTNESS_TESTS
+)
+
 # Circuit with 9 bits up to 16 bits are currently using the CRT circuit. We do not test them here
 # as they take a bit more time than non-CRT based FHE circuit.
 # N_BITS_THRESHOLD_FOR_CRT_FHE_CIRCUITS defines the threshold for which the circuit will be using
 # the CRT.
 N_BITS_THRESHOLD_FOR_CRT_FHE_CIRCUITS = 9
 
+# Model classes, gathered once as they are looked up in almost every check
+LINEAR_MODELS = frozenset(get_sklearn_linear_models())
+NEURAL_NET_MODELS = frozenset(get_sklearn_neural_net_models())
+TREE_MODELS = frozenset(get_sklearn_tree_models())
+DECISION_TREE_MODELS = frozenset(get_sklearn_tree_models(str_in_class_name="DecisionTree"))
+RANDOM_FOREST_MODELS = frozenset(get_sklearn_tree_models(str_in_class_name="RandomForest"))
+XGB_MODELS = frozenset(get_sklearn_tree_models(str_in_class_name="XGB"))
+
+# Minimal scores reached by Concrete ML models compared to their scikit-learn equivalent, in
+# check_correctness_with_sklearn. Models that are not listed use 0.9
+# FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/2604
+# Generic tests look to show issues in accuracy / R2 score, even for high n_bits
+
+# For regressions
+ACCEPTANCE_R2_SCORES = {
+    "TweedieRegressor": 0.9,
+    "GammaRegressor": 0.9,
+    "LinearRegression": 0.9,
+    "LinearSVR": 0.9,
+    "PoissonRegressor": 0.9,
+    "Lasso": 0.9,
+    "Ridge": 0.9,
+    "ElasticNet": 0.9,
+    "XGBRegressor": -0.2,
+    "NeuralNetRegressor": -10,
+}
+
+# For classifiers
+THRESHOLD_ACCURACIES = {
+    "LogisticRegression": 0.9,
+    "LinearSVC": 0.9,
+    "XGBClassifier": 0.7,
+    "RandomForestClassifier": 0.8,
+    "NeuralNetClassifier": 0.7,
+}
+
+def get_rng():
+    """Return a new random generator, seeded from numpy's global random state.
+
+    The global random state is seeded for each test by the autoseeding_of_everything fixture, which
+    keeps the generator reproducible (with --forcing_random_seed) whatever the tests' order.
+    """
+    return numpy.random.default_rng(numpy.random.randint(0, 2**31))
+
+
+def get_collection_skip_reason(params: Dict[str, Any], is_weekly_option: bool) -> Optional[str]:
+    """Get the reason for skipping a test, from its parameters.
+
+    This function is called by the conftest's pytest_collection_modifyitems hook, in order to skip
+    the tests at collection time, before their fixtures are set up.
+
+    Args:
+        params (Dict[str, Any]): The test's parameters.
+        is_weekly_option (bool): If the tests are executed in weekly builds.
+
+    Returns:
+        Optional[str]: The reason for skipping the test, None if it should not be skipped.
+    """
+    if "model_class" not in params or "n_bits" not in params:
+        return None
+
+    return _get_weekly_skip_reason(params["model_class"], params["n_bits"], is_weekly_option)
+
+
+def _get_weekly_skip_reason(model_class, n_bits, is_weekly_option):
+    """Get the reason for skipping n_bits only tested in weekly builds, except for linear models."""
+
+    if n_bits in N_BITS_WEEKLY_ONLY_BUILDS and not is_weekly_option:
+        if not is_model_class_in_a_list(model_class, LINEAR_MODELS):
+            return "Skipping some tests in non-weekly builds, except for linear models"
+
+    return None
+
+
+def _maybe_skip_weekly(model_class, n_bits, is_weekly_option):
+    """Skip the test if n_bits is only tested in weekly builds, except for linear models.
+
+    These tests are already skipped at collection time (see get_collection_skip_reason), this is
+    only a safeguard for the tests that would get their model class or n_bits differently.
+    """
+
+    skip_reason = _get_weekly_skip_reason(model_class, n_bits, is_weekly_option)
+
+    if skip_reason is not None:
+        pytest.skip(skip_reason)
+
 
 def get_dataset(model_class, parameters, n_bits, load_data, is_weekly_option):
     """Prepare the the (x, y) dataset."""
 
-    if not is_model_class_in_a_list(model_class, get_sklearn_linear_models()):
-        if n_bits in N_BITS_WEEKLY_ONLY_BUILDS and not is_weekly_option:
-            pytest.skip("Skipping some tests in non-weekly builds, except for linear models")
+    _maybe_skip_weekly(model_class, n_bits, is_weekly_option)
 
     # Get the dataset. The data generation is seeded in load_data.
     x, y = load_data(model_class, **parameters)
@@ -126,11 +231,8 @@ def get_dataset(model_class, parameters, n_bits, load_data, is_weekly_option):
 def preamble(model_class, parameters, n_bits, load_data, is_weekly_option):
     """Prepare the fitted model, and the (x, y) dataset."""
 
-    if not is_model_class_in_a_list(model_class, get_sklearn_linear_models()):
-        if n_bits in N_BITS_WEEKLY_ONLY_BUILDS and not is_weekly_option:
-            pytest.skip("Skipping some tests in non-weekly builds")
-
-    # Get the dataset. The data generation is seeded in load_data.
+    # Get the dataset, skipping the test in non-weekly builds if needed. The data generation is
+    # seeded in load_data.
     model = instantiate_model_generic(model_class, n_bits=n_bits)
     x, y = get_dataset(model_class, parameters, n_bits, load_data, is_weekly_option)
 
@@ -161,43 +263,16 @@ def check_correctness_with_sklearn(
         warnings.simplefilter("ignore", category=ConvergenceWarning)
         model, sklearn_model = model.fit_benchmark(x, y)
 
-    y_pred = model.predict(x)
-
     y_pred_sklearn = sklearn_model.predict(x)
     y_pred_cml = model.predict(x, fhe=fhe)
 
-    # Check that the output shapes are correct
-    assert y_pred.shape == y_pred_cml.shape, "Outputs have different shapes"
-
-    # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/2604
-    # Generic tests look to show issues in accuracy / R2 score, even for high n_bits
-
-    # For regressions
-    acceptance_r2score_dic = {
-        "TweedieRegressor": 0.9,
-        "GammaRegressor": 0.9,
-        "LinearRegression": 0.9,
-        "LinearSVR": 0.9,
-        "PoissonRegressor": 0.9,
-        "Lasso": 0.9,
-        "Ridge": 0.9,
-        "ElasticNet": 0.9,
-        "XGBRegressor": -0.2,
-        "NeuralNetRegressor": -10,
-    }
-
-    # For classifiers
-    threshold_accuracy_dic = {
-        "LogisticRegression": 0.9,
-        "LinearSVC": 0.9,
-        "XGBClassifier": 0.7,
-        "RandomForestClassifier": 0.8,
-        "NeuralNetClassifier": 0.7,
-    }
+    # Check that both models made a prediction for each sample. Shapes are not compared as
+    # Concrete ML's tree-based regressors return 2D arrays, unlike scikit-learn's
+    assert len(y_pred_cml) == len(y_pred_sklearn), "Outputs have different lengths"
 
     model_name = get_model_name(model_class)
-    acceptance_r2score = acceptance_r2score_dic.get(model_name, 0.9)
-    threshold_accuracy = threshold_accuracy_dic.get(model_name, 0.9)
+    acceptance_r2score = ACCEPTANCE_R2_SCORES.get(model_name, 0.9)
+    threshold_accuracy = THRESHOLD_ACCURACIES.get(model_name, 0.9)
 
     # If the model is a classifier, check that accuracies are similar
     if is_classifier_or_partial_classifier(model):
@@ -220,17 +295,20 @@ def check_double_fit(model_class, n_bits, x, y):
         warnings.simplefilter("ignore", category=ConvergenceWarning)
 
         # First fit: here, we really need to fit, we can't reuse an already fitted model
-        if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
+        if is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
+            # PyTorch is only needed for neural networks
+            # pylint: disable-next=import-outside-toplevel
+            import torch
 
             # Generate a seed for the PyTorch RNG
-            main_seed = numpy.random.randint(0, 2**63)
+            main_seed = int(get_rng().integers(0, 2**63))
             torch.manual_seed(main_seed)
 
         model.fit(x, y)
         y_pred_one = model.predict(x)
 
         # Second fit: here, we really need to fit, we can't reuse an already fitted model
-        if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
+        if is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
             torch.manual_seed(main_seed)
 
         model.fit(x, y)
@@ -239,79 +317,68 @@ def check_double_fit(model_class, n_bits, x, y):
     assert numpy.array_equal(y_pred_one, y_pred_two)
 
 
-def check_serialization(model, x):
-    """Check serialization."""
+def get_serialization_methods(model_class, io_backend):
+    """Return the (serializing, deserializing) pairs of methods to check for an I/O backend.
 
-    model_class = get_model_class(model)
+    The file-based methods are wrapped in order to work with strings, using an in-memory file, so
+    that both backends can be checked the same way.
+    """
+    if io_backend == "string":
+        return [(dumps, loads), (model_class.dumps, model_class.loads)]
 
-    # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/3134
-    # Waiting that QNN are serialized
-    if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
-        pytest.skip(f"Serialization not supported yet for {model_class}")
+    assert io_backend == "file", f"Unknown I/O backend {io_backend}"
 
-    check_serialization_dump_load(model, x)
-    check_serialization_dumps_loads(model, x)
+    def to_string_methods(dump_method, load_method):
+        """Wrap file-based dump/load methods into string-based ones."""
 
+        def dumps_method(obj):
+            """Dump the object into a string, through an in-memory file."""
+            with io.StringIO() as file:
+                dump_method(obj, file=file)
+                return file.getvalue()
 
-def check_serialization_dump_load(model, x):
-    """Check that a model can be serialized two times using dump/load methods."""
+        def loads_method(content):
+            """Load the object from a string, through an in-memory file."""
+            with io.StringIO(content) as file:
+                return load_method(file=file)
 
-    model_class = get_model_class(model)
+        return dumps_method, loads_method
+
+    return [
+        to_string_methods(dump, load),
+        to_string_methods(model_class.dump, model_class.load),
+    ]
 
-    with tempfile.TemporaryFile("w+") as temp_dump:
-        # Disable mypy
-        for (dump_method, load_method) in [
-            (dump, load),
-            (model_class.dump, model_class.load),
-        ]:
-            # Dump the model into the file
-            temp_dump.seek(0)
-            temp_dump.truncate(0)
-            dump_method(model, file=temp_dump)
-
-            # Load the model from the file as a dict using json
-            temp_dump.seek(0)
-            serialized_model_dict: Dict = json.load(temp_dump)
-
-            # Load the model from the file using Concrete ML's method
-            temp_dump.seek(0)
-            loaded_model = load_method(file=temp_dump)
-
-            # Dump the loaded model into the file using Concrete ML's method
-            temp_dump.seek(0)
-            temp_dump.truncate(0)
-            dump_method(loaded_model, file=temp_dump)
-
-            # Load the model from the file again as a dict using json
-            temp_dump.seek(0)
-            re_serialized_model_dict: Dict = json.load(temp_dump)
-
-            # Check that the dictionaries are identical (except for sklearn_model attribute, as
-            # it is serialized using the pickle library, which does not handle double serialization)
-            del serialized_model_dict["sklearn_model"]
-            del re_serialized_model_dict["sklearn_model"]
-            assert serialized_model_dict == re_serialized_model_dict
-
-            # Check that the predictions made by both model are identical
-            y_pred_model = model.predict(x)
-            y_pred_loaded_model = loaded_model.predict(x)
-            assert numpy.array_equal(y_pred_model, y_pred_loaded_model)
-
-            # Check that the predictions made by both Scikit-Learn model are identical
-            y_pred_sklearn_model = model.sklearn_model.predict(x)
-            y_pred_loaded_sklearn_model = loaded_model.sklearn_model.predict(x)
-            assert numpy.array_equal(y_pred_sklearn_model, y_pred_loaded_sklearn_model)
-
-
-def check_serialization_dumps_loads(model, x):
-    """Check that a model can be serialized two times using dumps/loads methods."""
+
+def get_serialized_model_digest(serialized_model: str) -> bytes:
+    """Return a digest of a serialized model, ignoring its sklearn_model attribute.
+
+    The sklearn_model attribute is serialized using the pickle library, which does not handle
+    double serialization, and is therefore not considered. Keys are sorted so that the digest only
+    depends on the model's content.
+    """
+    serialized_model_dict: Dict = json.loads(serialized_model)
+    del serialized_model_dict["sklearn_model"]
+
+    canonical_serialized_model = json.dumps(serialized_model_dict, sort_keys=True)
+    return hashlib.blake2b(canonical_serialized_model.encode()).digest()
+
+
+def check_serialization(model, x, io_backend):
+    """Check that a model can be serialized two times, either in a file or in a string."""
 
     model_class = get_model_class(model)
 
-    for (dumps_method, loads_method) in [
-        (dumps, loads),
-        (model_class.dumps, model_class.loads),
-    ]:
+    # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/3134
+    # Waiting that QNN are serialized
+    if is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
+        pytest.skip(f"Serialization not supported yet for {model_class}")
+
+    # Compute the predictions of the initial model only once, as they are the reference
+    y_pred_model = model.predict(x)
+    y_pred_sklearn_model = model.sklearn_model.predict(x)
+
+    for (dumps_method, loads_method) in get_serialization_methods(model_class, io_backend):
         # Dump the model into a string
         serialized_model = dumps_method(model)
 
@@ -321,23 +388,16 @@ def check_serialization_dumps_loads(model, x):
         # Dump the model into a string again
         re_serialized_model: str = dumps_method(loaded_model)
 
-        # Load both strings using json
-        serialized_model_dict: Dict = json.loads(serialized_model)
-        re_serialized_model_dict: Dict = json.loads(re_serialized_model)
-
-        # Check that the dictionaries are identical (except for sklearn_model attribute, as
-        # it is serialized using the pickle library, which does not handle double serialization)
-        del serialized_model_dict["sklearn_model"]
-        del re_serialized_model_dict["sklearn_model"]
-        assert serialized_model_dict == re_serialized_model_dict
+        # Check that both serialized models are identical (except for sklearn_model attribute)
+        assert get_serialized_model_digest(serialized_model) == get_serialized_model_digest(
+            re_serialized_model
+        ), "The model is not serialized identically after being loaded"
 
         # Check that the predictions made by both model are identical
-        y_pred_model = model.predict(x)
         y_pred_loaded_model = loaded_model.predict(x)
         assert numpy.array_equal(y_pred_model, y_pred_loaded_model)
 
         # Check that the predictions made by both Scikit-Learn model are identical
-        y_pred_sklearn_model = model.sklearn_model.predict(x)
         y_pred_loaded_sklearn_model = loaded_model.sklearn_model.predict(x)
         assert numpy.array_equal(y_pred_sklearn_model, y_pred_loaded_sklearn_model)
 
@@ -347,7 +407,7 @@ def check_offset(model_class, n_bits, x, y):
     model = instantiate_model_generic(model_class, n_bits=n_bits)
 
     # Offsets are not supported by XGBoost
-    if is_model_class_in_a_list(model_class, get_sklearn_tree_models(str_in_class_name="XGB")):
+    if is_model_class_in_a_list(model_class, XGB_MODELS):
         # No pytest.skip, since it is not a bug but something which is inherent to XGB
         return
 
@@ -355,14 +415,13 @@ def check_offset(model_class, n_bits, x, y):
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", category=ConvergenceWarning)
 
-        # Add the offset: here, we really need to fit, we can't reuse an already fitted model
-        y += 3
-        model.fit(x, y)
+        # Add the offset: here, we really need to fit, we can't reuse an already fitted model.
+        # The offset targets are new arrays, so that the caller's targets are left unchanged
+        model.fit(x, y + 3)
         model.predict(x[:1])
 
         # Another offset: here, we really need to fit, we can't reuse an already fitted model
-        y -= 2
-        model.fit(x, y)
+        model.fit(x, y + 1)
 
 
 def check_subfunctions(fitted_model, model_class, x):
@@ -392,7 +451,7 @@ def check_subfunctions(fitted_model, model_class, x):
         fitted_model.predict_proba(x)
 
         # Only linear classifiers have a decision function method
-        if is_model_class_in_a_list(model_class, get_sklearn_linear_models()):
+        if is_model_class_in_a_list(model_class, LINEAR_MODELS):
             fitted_model.decision_function(x)
 
 
@@ -402,12 +461,19 @@ def check_subfunctions_in_fhe(model, fhe_circuit, x):
     # Generate the keys
     fhe_circuit.keygen()
 
-    y_pred_fhe = []
+    # Quantize all the inputs (float) at once, as the quantization is done element-wise
+    q_inputs = model.quantize_input(x)
+
+    # Compute the expected predictions with the FHE simulation mode, which is deterministic
+    y_pred_expected_in_simulation = model.predict(x, fhe="simulate")
 
     for _ in range(N_ALLOWED_FHE_RUN):
-        for f_input in x:
-            # Quantize an input (float)
-            q_input = model.quantize_input(f_input.reshape(1, -1))
+
+        q_y_list = []
+
+        for i in range(q_inputs.shape[0]):
+            # The circuit handles a single sample at a time
+            q_input = q_inputs[i : i + 1]
 
             # Encrypt the input
             q_input_enc = fhe_circuit.encrypt(q_input)
@@ -417,28 +483,27 @@ def check_subfunctions_in_fhe(model, fhe_circuit, x):
 
             # Decrypt the result (integer)
             q_y = fhe_circuit.decrypt(q_y_enc)
+            q_y_list.append(q_y[0])
 
-            # Dequantize the result
-            y = model.dequantize_output(q_y)
+        # Dequantize the results of all samples at once
+        y = model.dequantize_output(numpy.array(q_y_list))
 
-            # Apply either the sigmoid if it is a binary classification task,
-            # which is the case in this example, or a softmax function in order
-            # to get the probabilities (in the clear)
-            y_proba = model.post_processing(y)
+        # Apply either the sigmoid if it is a binary classification task,
+        # which is the case in this example, or a softmax function in order
+        # to get the probabilities (in the clear)
+        y_proba = model.post_processing(y)
 
-            # Apply the argmax to get the class predictions (in the clear)
-            if is_classifier_or_partial_classifier(model):
-                y_class = numpy.argmax(y_proba, axis=-1)
-                y_pred_fhe += list(y_class)
-            else:
-                y_pred_fhe += list(y_proba)
+        # Apply the argmax to get the class predictions (in the clear)
+        if is_classifier_or_partial_classifier(model):
+            y_pred_fhe = numpy.argmax(y_proba, axis=-1)
+        else:
+            y_pred_fhe = y_proba
 
         # Compare with the FHE simulation mode
-        y_pred_expected_in_simulation = model.predict(x, fhe="simulate")
-        if numpy.isclose(numpy.array(y_pred_fhe), y_pred_expected_in_simulation).all():
+        if numpy.allclose(y_pred_fhe, y_pred_expected_in_simulation):
             break
 
-    assert numpy.isclose(numpy.array(y_pred_fhe), y_pred_expected_in_simulation).all(), (
+    assert numpy.allclose(y_pred_fhe, y_pred_expected_in_simulation), (
         "computations are not the same between individual functions (in FHE) "
         "and predict function (in FHE simulation mode)"
     )
@@ -453,10 +518,16 @@ def check_input_support(model_class, n_bits, default_configuration, x, y, input_
         assert input_type in ["pandas", "torch", "list", "numpy"], "Not a valid type casting"
 
         if input_type.lower() == "pandas":
+            # pylint: disable-next=import-outside-toplevel
+            import pandas
+
             # Turn into Pandas
             x = pandas.DataFrame(x)
             y = pandas.Series(y) if y.ndim == 1 else pandas.DataFrame(y)
         elif input_type.lower() == "torch":
+            # pylint: disable-next=import-outside-toplevel
+            import torch
+
             # Turn into Torch
             x = torch.tensor(x)
             y = torch.tensor(y)
@@ -477,12 +548,16 @@ def check_input_support(model_class, n_bits, default_configuration, x, y, input_
         warnings.simplefilter("ignore", category=ConvergenceWarning)
         model.fit(x, y)
 
+    # Only the input types are checked here, so a few samples are enough for predicting. Slicing
+    # works the same for all supported input types
+    x_small = x[:2]
+
     # Make sure `predict` is working when FHE is disabled
-    model.predict(x)
+    model.predict(x_small)
 
     # Similarly, we test `predict_proba` for classifiers
     if is_classifier_or_partial_classifier(model):
-        model.predict_proba(x)
+        model.predict_proba(x_small)
 
     # If n_bits is above N_BITS_LINEAR_MODEL_CRYPTO_PARAMETERS, do not compile the model
     # as there won't be any crypto parameters
@@ -492,47 +567,48 @@ def check_input_support(model_class, n_bits, default_configuration, x, y, input_
     model.compile(x, default_configuration)
 
     # Make sure `predict` is working when FHE is disabled
-    model.predict(x, fhe="simulate")
+    model.predict(x_small, fhe="simulate")
 
     # Similarly, we test `predict_proba` for classifiers
     if is_classifier_or_partial_classifier(model):
-        model.predict_proba(x, fhe="simulate")
+        model.predict_proba(x_small, fhe="simulate")
 
 
-def check_pipeline(model_class, x, y):
+def check_pipeline(model_class, x, y, is_weekly_option):
     """Check pipeline support."""
 
     # Pipeline test sometimes fails with RandomForest models. This bug may come from Hummingbird
     # and needs further investigations
     # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/2779
-    if is_model_class_in_a_list(
-        model_class, get_sklearn_tree_models(str_in_class_name="RandomForest")
-    ):
+    if is_model_class_in_a_list(model_class, RANDOM_FOREST_MODELS):
         pytest.skip("Skipping pipeline test for RF, doesn't work for now")
 
-    hyper_param_combinations = get_hyper_param_combinations(model_class)
+    hyper_param_combinations = get_hyper_param_combinations(model_class, is_weekly_option)
 
-    # Prepare the list of all hyper parameters
-    hyperparameters_list = [
-        {key: value} for key, values in hyper_param_combinations.items() for value in values
+    # Prepare the list of all (hyper parameter, value) pairs
+    hyperparameters_items = [
+        (key, value) for key, values in hyper_param_combinations.items() for value in values
     ]
 
+    rng = get_rng()
+
     # Take one of the hyper_parameters randomly (testing everything would be too long)
-    if len(hyperparameters_list) == 0:
+    if len(hyperparameters_items) == 0:
         hyper_parameters = {}
     else:
-        hyper_parameters = hyperparameters_list[numpy.random.randint(0, len(hyperparameters_list))]
+        key, value = hyperparameters_items[rng.integers(0, len(hyperparameters_items))]
+        hyper_parameters = {key: value}
 
     pipe_cv = Pipeline(
         [
-            ("pca", PCA(n_components=2, random_state=numpy.random.randint(0, 2**15))),
+            ("pca", PCA(n_components=2, random_state=int(rng.integers(0, 2**15)))),
             ("scaler", StandardScaler()),
             ("model", model_class(**hyper_parameters)),
         ]
     )
 
     # Do a grid search to find the best hyper-parameters
-    if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
+    if is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
         param_grid = {
             "model__module__n_w_bits": [2, 3],
             "model__module__n_a_bits": [2, 3],
@@ -559,17 +635,20 @@ def check_grid_search(model_class, x, y):
     else:
         grid_scorer = make_scorer(mean_squared_error, greater_is_better=True)
 
-    if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
+    if is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
+        # pylint: disable-next=import-outside-toplevel
+        from torch import nn
+
         param_grid = {
             "module__n_layers": [2, 3],
             "module__n_hidden_neurons_multiplier": [1],
             "module__activation_function": (nn.ReLU6,),
         }
-    elif model_class in get_sklearn_tree_models(str_in_class_name="DecisionTree"):
+    elif model_class in DECISION_TREE_MODELS:
         param_grid = {
             "n_bits": [20],
         }
-    elif model_class in get_sklearn_tree_models():
+    elif model_class in TREE_MODELS:
         param_grid = {
             "n_bits": [20],
             "max_depth": [2],
@@ -600,7 +679,7 @@ def check_sklearn_equivalence(model_class, n_bits, x, y, check_accuracy, check_r
     # of the QNN instantiation in `instantiate_model_generic` takes `n_bits` as
     # a target accumulator and sets 3-b w&a for these tests. Thus it's
     # impossible to reach R-2 of 0.99 when comparing the two NN models returned by `fit_benchmark`
-    if is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
+    if is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
         pytest.skip("Skipping sklearn-equivalence test for NN, doesn't work for now")
 
     # Sometimes, we miss convergence, which is not a problem for our test
@@ -642,20 +721,20 @@ def check_sklearn_equivalence(model_class, n_bits, x, y, check_accuracy, check_r
 def check_properties_of_circuit(model_class, fhe_circuit, check_circuit_has_no_tlu):
     """Check some properties of circuit, depending on the model class"""
 
-    if is_model_class_in_a_list(model_class, get_sklearn_linear_models()):
+    if is_model_class_in_a_list(model_class, LINEAR_MODELS):
         # Check that no TLUs are found within the MLIR
         check_circuit_has_no_tlu(fhe_circuit)
 
 
-def get_hyper_param_combinations(model_class):
-    """Return the hyper_param_combinations, depending on the model class"""
+def get_hyper_param_combinations(model_class, is_weekly_option):
+    """Return the hyper_param_combinations, depending on the model class and the build type"""
     hyper_param_combinations: Dict[str, List[Any]]
 
-    if is_model_class_in_a_list(model_class, get_sklearn_linear_models()):
+    if is_model_class_in_a_list(model_class, LINEAR_MODELS):
         hyper_param_combinations = {"fit_intercept": [False, True]}
-    elif model_class in get_sklearn_tree_models(str_in_class_name="DecisionTree"):
+    elif model_class in DECISION_TREE_MODELS:
         hyper_param_combinations = {}
-    elif model_class in get_sklearn_tree_models(str_in_class_name="RandomForest"):
+    elif model_class in RANDOM_FOREST_MODELS:
         hyper_param_combinations = {
             "max_depth": [3, 4, 5, 10],
             "min_samples_split": [2, 3, 4, 5],
@@ -664,29 +743,33 @@ def get_hyper_param_combinations(model_class):
             "max_features": ["sqrt", "log2"],
             "max_leaf_nodes": [None, 5, 10, 20],
         }
-    elif model_class in get_sklearn_tree_models(str_in_class_name="XGB"):
+    elif model_class in XGB_MODELS:
+        # Each hyper-parameter is tested independently, so its extreme values are enough. This
+        # keeps the number of XGB fits done in check_hyper_parameters low
         hyper_param_combinations = {
-            "max_depth": [3, 4, 5, 10],
-            "learning_rate": [1, 0.5, 0.1],
-            "n_estimators": [1, 50, 100, 1000],
-            "tree_method": ["auto", "exact", "approx"],
-            "gamma": [0, 0.1, 0.5],
-            "min_child_weight": [1, 5, 10],
-            "max_delta_step": [0, 0.5, 0.7],
-            "subsample": [0.5, 0.9, 1.0],
-            "colsample_bytree": [0.5, 0.9, 1.0],
-            "colsample_bylevel": [0.5, 0.9, 1.0],
-            "colsample_bynode": [0.5, 0.9, 1.0],
-            "reg_alpha": [0, 0.1, 0.5],
-            "reg_lambda": [0, 0.1, 0.5],
-            "scale_pos_weight": [0.5, 0.9, 1.0],
+            "max_depth": [3, 10],
+            "learning_rate": [1, 0.1],
+            # Fitting 1000 trees is long and does not bring more coverage than 100 trees, it is
+            # therefore only done in weekly builds
+            "n_estimators": [1, 100, 1000] if is_weekly_option else [1, 100],
+            "tree_method": ["auto", "approx"],
+            "gamma": [0, 0.5],
+            "min_child_weight": [1, 10],
+            "max_delta_step": [0, 0.7],
+            "subsample": [0.5, 1.0],
+            "colsample_bytree": [0.5, 1.0],
+            "colsample_bylevel": [0.5, 1.0],
+            "colsample_bynode": [0.5, 1.0],
+            "reg_alpha": [0, 0.5],
+            "reg_lambda": [0, 0.5],
+            "scale_pos_weight": [0.5, 1.0],
             "importance_type": ["weight", "gain"],
             "base_score": [0.5, None],
         }
     else:
 
         assert is_model_class_in_a_list(
-            model_class, get_sklearn_neural_net_models()
+            model_class, NEURAL_NET_MODELS
         ), "models are supposed to be tree-based or linear or QNN's"
 
         hyper_param_combinations = {}
@@ -705,19 +788,19 @@ def check_hyper_parameters(
     test_correctness_in_clear,
     check_r2_score,
     check_accuracy,
+    is_weekly_option,
 ):
     """Check hyper parameters."""
-    hyper_param_combinations = get_hyper_param_combinations(model_class)
+    hyper_param_combinations = get_hyper_param_combinations(model_class, is_weekly_option)
 
-    # Prepare the list of all hyper parameters
-    hyperparameters_list = [
-        {key: value} for key, values in hyper_param_combinations.items() for value in values
-    ]
-
-    for hyper_parameters in hyperparameters_list:
+    # Generate all hyper parameters, each one being tested on its own along with n_bits
+    hyperparameters_generator = (
+        {key: value, "n_bits": n_bits}
+        for key, values in hyper_param_combinations.items()
+        for value in values
+    )
 
-        # Add n_bits
-        hyper_parameters["n_bits"] = n_bits
+    for hyper_parameters in hyperparameters_generator:
 
         model = instantiate_model_generic(model_class, **hyper_parameters)
 
@@ -750,8 +833,8 @@ def check_hyper_parameters(
             )
 
 
-def check_fitted_compiled_error_raises(model_class, n_bits, x, y):
-    """Check that methods that require the model to be compiled or fitted raise proper errors."""
+def check_unfitted_error_raises(model_class, n_bits, x):
+    """Check that methods that require the model to be fitted raise proper errors."""
 
     model = instantiate_model_generic(model_class, n_bits=n_bits)
 
@@ -773,14 +856,14 @@ def check_fitted_compiled_error_raises(model_class, n_bits, x, y):
 
     # Predicting in clear using an untrained model should not be possible for linear and
     # tree-based models
-    if not is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
+    if not is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
         with pytest.raises(AttributeError, match=".* model is not fitted.*"):
             model.predict(x)
 
     if is_classifier_or_partial_classifier(model_class):
         # Predicting probabilities using an untrained linear or tree-based classifier should not
         # be possible
-        if not is_model_class_in_a_list(model_class, get_sklearn_neural_net_models()):
+        if not is_model_class_in_a_list(model_class, NEURAL_NET_MODELS):
             with pytest.raises(AttributeError, match=".* model is not fitted.*"):
                 model.predict_proba(x)
 
@@ -791,10 +874,16 @@ def check_fitted_compiled_error_raises(model_class, n_bits, x, y):
 
         # Computing the decision function using an untrained classifier should not be possible.
         # Note that the `decision_function` method is only available for linear models
-        if is_model_class_in_a_list(model_class, get_sklearn_linear_models()):
+        if is_model_class_in_a_list(model_class, LINEAR_MODELS):
             with pytest.raises(AttributeError, match=".* model is not fitted.*"):
                 model.decision_function(x)
 
+
+def check_fitted_compiled_error_raises(model_class, n_bits, x, y):
+    """Check that methods that require the model to be compiled raise proper errors."""
+
+    model = instantiate_model_generic(model_class, n_bits=n_bits)
+
     with warnings.catch_warnings():
         # Sometimes, we miss convergence, which is not a problem for our test
         warnings.simplefilter("ignore", category=ConvergenceWarning)
@@ -807,7 +896,7 @@ def check_fitted_compiled_error_raises(model_class, n_bits, x, y):
     # Predicting probabilities in FHE using a trained QNN classifier that is not compiled should
     # not be possible
     if is_classifier_or_partial_classifier(model_class) and is_model_class_in_a_list(
-        model_class, get_sklearn_neural_net_models()
+        model_class, NEURAL_NET_MODELS
     ):
         with pytest.raises(AttributeError, match=".* model is not compiled.*"):
             model.predict_proba(x, fhe="execute")
@@ -816,8 +905,9 @@ def check_fitted_compiled_error_raises(model_class, n_bits, x, y):
 def check_class_mapping(model, x, y):
     """Check that classes with arbitrary labels are handled for all classifiers."""
 
-    # Retrieve the data's target labels
-    classes = numpy.unique(y)
+    # Retrieve the data's target labels. They are small non-negative integers, so counting them
+    # avoids the sort done by numpy.unique
+    classes = numpy.bincount(y.astype(numpy.intp)).nonzero()[0]
 
     # Make sure these targets are ordered by default
     assert numpy.array_equal(numpy.arange(len(classes)), classes)
@@ -831,8 +921,23 @@ def check_class_mapping(model, x, y):
     # Compute the predictions
     y_pred = model.predict(x)
 
-    # Shuffle the initial labels (in place)
-    numpy.random.shuffle(classes)
+    # Shuffle the initial labels, in a new array
+    classes = get_rng().permutation(classes)
+
+    # Fitting tree-based models and neural networks is long. Since the shuffled labels are only a
+    # permutation of the initial ones, these models are not fitted again. Instead, the fitted
+    # model's classes are replaced by the shuffled labels, which checks that the predictions are
+    # mapped to the model's classes
+    if is_model_class_in_a_list(model, TREE_MODELS | NEURAL_NET_MODELS):
+        model.target_classes_ = classes
+
+        # Compute the predictions
+        y_pred_shuffled = model.predict(x)
+
+        # Check that the predictions were mapped to the shuffled labels
+        assert numpy.array_equal(classes[y_pred], y_pred_shuffled)
+
+        return
 
     # Map each targets' label to the the new shuffled ones
     new_y = classes[y]
@@ -847,17 +952,13 @@ def check_class_mapping(model, x, y):
     y_pred_shuffled = model.predict(x)
 
     # Check that the mapping of labels was kept by Concrete ML
-    numpy.array_equal(classes[y_pred], y_pred_shuffled)
+    assert numpy.array_equal(classes[y_pred], y_pred_shuffled)
 
 
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    [
-        n
-        for n in N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS
-        if n >= N_BITS_THRESHOLD_FOR_SKLEARN_EQUIVALENCE_TESTS
-    ],
+    N_BITS_SKLEARN_EQUIVALENCE_TESTS,
 )
 # pylint: disable=too-many-arguments
 def test_quantization(
@@ -882,11 +983,7 @@ def test_quantization(
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    [
-        n
-        for n in N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS
-        if n >= N_BITS_THRESHOLD_FOR_SKLEARN_CORRECTNESS_TESTS
-    ],
+    N_BITS_SKLEARN_CORRECTNESS_TESTS,
 )
 # pylint: disable=too-many-arguments
 def test_correctness_with_sklearn(
@@ -920,7 +1017,7 @@ def test_correctness_with_sklearn(
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS,
+    N_BITS_NO_COMPILATION_TESTS,
 )
 # pylint: disable=too-many-arguments
 def test_hyper_parameters(
@@ -949,6 +1046,7 @@ def test_hyper_parameters(
         test_correctness_in_clear,
         check_r2_score,
         check_accuracy,
+        is_weekly_option,
     )
 
 
@@ -967,6 +1065,15 @@ def test_grid_search(
     verbose=True,
 ):
     """Test Grid search."""
+
+    # Grid searches fit the model many times, which is long for tree-based models and neural
+    # networks. The grid search code path is the same for all models, so these are only tested
+    # in weekly builds
+    if not is_weekly_option and is_model_class_in_a_list(
+        model_class, TREE_MODELS | NEURAL_NET_MODELS
+    ):
+        pytest.skip("Skipping grid search for tree-based models and QNNs in non-weekly builds")
+
     x, y = get_dataset(model_class, parameters, n_bits, load_data, is_weekly_option)
 
     if verbose:
@@ -978,13 +1085,15 @@ def test_grid_search(
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS,
+    N_BITS_NO_COMPILATION_TESTS,
 )
+@pytest.mark.parametrize("io_backend", ["file", "string"])
 # pylint: disable=too-many-arguments
 def test_serialization(
     model_class,
     parameters,
     n_bits,
+    io_backend,
     load_data,
     is_weekly_option,
     verbose=True,
@@ -995,13 +1104,13 @@ def test_serialization(
     if verbose:
         print("Run check_serialization")
 
-    check_serialization(model, x)
+    check_serialization(model, x, io_backend)
 
 
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS,
+    N_BITS_NO_COMPILATION_TESTS,
 )
 # pylint: disable=too-many-arguments
 def test_double_fit(
@@ -1024,7 +1133,7 @@ def test_double_fit(
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS,
+    N_BITS_NO_COMPILATION_TESTS,
 )
 # pylint: disable=too-many-arguments
 def test_offset(
@@ -1047,16 +1156,14 @@ def test_offset(
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS,
+    N_BITS_ALL_BUILDS,
 )
-@pytest.mark.parametrize("input_type", ["numpy", "torch", "pandas", "list"])
 # pylint: disable=too-many-arguments
 def test_input_support(
     model_class,
     parameters,
     n_bits,
     load_data,
-    input_type,
     default_configuration,
     is_weekly_option,
     verbose=True,
@@ -1064,16 +1171,19 @@ def test_input_support(
     """Test all models with Pandas, List or Torch inputs."""
     x, y = get_dataset(model_class, parameters, n_bits, load_data, is_weekly_option)
 
-    if verbose:
-        print("Run input_support")
+    # The input types are checked within a single test, which shares the data-set and the
+    # fixtures' setup between them
+    for input_type in ["numpy", "torch", "pandas", "list"]:
+        if verbose:
+            print(f"Run input_support with input_type = {input_type}")
 
-    check_input_support(model_class, n_bits, default_configuration, x, y, input_type)
+        check_input_support(model_class, n_bits, default_configuration, x, y, input_type)
 
 
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS,
+    N_BITS_NO_COMPILATION_TESTS,
 )
 # pylint: disable=too-many-arguments
 def test_subfunctions(
@@ -1096,7 +1206,8 @@ def test_subfunctions(
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
 @pytest.mark.parametrize(
     "n_bits",
-    N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS,
+    # check_pipeline grid searches over n_bits itself, so a single value is enough here
+    [min(N_BITS_REGULAR_BUILDS)],
 )
 # pylint: disable=too-many-arguments
 def test_pipeline(
@@ -1113,30 +1224,18 @@ def test_pipeline(
     if verbose:
         print("Run check_pipeline")
 
-    check_pipeline(model_class, x, y)
+    check_pipeline(model_class, x, y, is_weekly_option)
 
 
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
-@pytest.mark.parametrize(
-    "simulate",
-    [
-        pytest.param(False, id="fhe"),
-        pytest.param(True, id="simulate"),
-    ],
-)
 @pytest.mark.parametrize(
     "n_bits",
-    [
-        n
-        for n in N_BITS_WEEKLY_ONLY_BUILDS + N_BITS_REGULAR_BUILDS
-        if n >= N_BITS_THRESHOLD_FOR_PREDICT_CORRECTNESS_TESTS
-    ],
+    N_BITS_PREDICT_CORRECTNESS_TESTS,
 )
 # pylint: disable=too-many-arguments, too-many-branches
 def test_predict_correctness(
     model_class,
     parameters,
-    simulate,
     n_bits,
     load_data,
     default_configuration,
@@ -1146,25 +1245,27 @@ def test_predict_correctness(
     test_subfunctions_in_fhe=True,
     verbose=True,
 ):
-    """Test correct execution, if there is sufficiently n_bits."""
+    """Test correct execution, if there is sufficiently n_bits.
+
+    The model is compiled once, and the circuit is then checked both in FHE simulation and in FHE.
+    """
+
+    model, x = preamble(model_class, parameters, n_bits, load_data, is_weekly_option)
+
+    # The circuit is checked in FHE simulation first, as it is faster, and then in FHE
+    simulate_values = [True, False]
 
     # Will be reverted when it works
     # FIXME: https://github.com/zama-ai/concrete-ml-internal/issues/3118
     # FIXME: https://github.com/zama-ai/concrete-numpy-internal/issues/1859
-    if (
-        (n_bits >= N_BITS_THRESHOLD_FOR_CRT_FHE_CIRCUITS)
-        and (model_class in get_sklearn_tree_models())
-        and not simulate
-    ):
-        pytest.skip("Skipping while bug concrete-numpy-internal/issues/1859 is being investigated")
-
-    model, x = preamble(model_class, parameters, n_bits, load_data, is_weekly_option)
+    if (n_bits >= N_BITS_THRESHOLD_FOR_CRT_FHE_CIRCUITS) and (model_class in TREE_MODELS):
+        if verbose:
+            print(
+                "Skipping FHE execution while bug concrete-numpy-internal/issues/1859 is being "
+                "investigated"
+            )
 
-    # How many samples for tests in FHE (ie, predict with fhe = "execute" or "simulate")
-    if is_weekly_option or simulate:
-        number_of_tests_in_fhe = 5
-    else:
-        number_of_tests_in_fhe = 1
+        simulate_values = [True]
 
     # How many samples for tests in quantized module (ie, predict with fhe = "disable")
     if is_weekly_option:
@@ -1209,36 +1310,77 @@ def test_predict_correctness(
             if verbose:
                 print("Compilation done")
 
-            if verbose:
-                print(
-                    "Run check_is_good_execution_for_cml_vs_circuit "
-                    + f"(with number_of_tests_in_fhe = {number_of_tests_in_fhe})"
-                )
+            # The circuit does not depend on the execution mode, it is thus shared between both
+            for simulate in simulate_values:
 
-            # Check the `predict` method
-            check_is_good_execution_for_cml_vs_circuit(
-                x[:number_of_tests_in_fhe], model=model, simulate=simulate
-            )
+                # How many samples for tests in FHE (ie, predict with fhe = "execute" or
+                # "simulate")
+                if is_weekly_option or simulate:
+                    number_of_tests_in_fhe = 5
+                else:
+                    number_of_tests_in_fhe = 1
 
-            if test_subfunctions_in_fhe and (not simulate):
                 if verbose:
-                    print("Testing subfunctions in FHE")
+                    print(
+                        f"Run check_is_good_execution_for_cml_vs_circuit (with simulate = "
+                        f"{simulate} and number_of_tests_in_fhe = {number_of_tests_in_fhe})"
+                    )
+
+                # Check the `predict` method
+                check_is_good_execution_for_cml_vs_circuit(
+                    x[:number_of_tests_in_fhe], model=model, simulate=simulate
+                )
 
-                check_subfunctions_in_fhe(model, fhe_circuit, x[:number_of_tests_in_fhe])
+                # Sub-functions are only checked in FHE for linear models or for the lowest
+                # bit-width, as it is slow and the coverage quickly saturates for other models
+                if (
+                    test_subfunctions_in_fhe
+                    and (not simulate)
+                    and (
+                        is_model_class_in_a_list(model_class, LINEAR_MODELS)
+                        or n_bits == N_BITS_SUBFUNCTIONS_IN_FHE_TESTS
+                    )
+                ):
+                    if verbose:
+                        print("Testing subfunctions in FHE")
+
+                    check_subfunctions_in_fhe(model, fhe_circuit, x[:number_of_tests_in_fhe])
 
         else:
             if verbose:
-                print(
-                    "Run predict in fhe='disable' "
-                    f"(with number_of_tests_in_non_fhe = {number_of_tests_in_non_fhe})"
-                )
+                print("Run predict in fhe='disable'")
 
-            # At least, check in clear mode
-            y_pred_fhe = model.predict(x[:number_of_tests_in_non_fhe], fhe="disable")
+            # At least, check in clear mode. As fhe="disable" is the default value, y_pred has
+            # already been computed this way, so the explicit call is only checked on one sample
+            y_pred_fhe = model.predict(x[:1], fhe="disable")
 
             # Check that the output shape is correct
-            assert y_pred_fhe.shape == y_pred.shape
-            assert numpy.array_equal(y_pred_fhe, y_pred)
+            assert y_pred_fhe.shape == y_pred[:1].shape
+            assert numpy.array_equal(y_pred_fhe, y_pred[:1])
+
+
+@pytest.mark.parametrize(
+    "model_class",
+    [
+        pytest.param(model_and_dataset.values[0], id=model_and_dataset.id)
+        for model_and_dataset in get_random_extract_of_sklearn_models_and_datasets()
+    ],
+)
+def test_unfitted_error_raises(model_class, verbose=True):
+    """Test that unfitted models raise proper errors.
+
+    These errors do not depend on the data-set, so the test is only done once per model class.
+    """
+    n_bits = min(N_BITS_REGULAR_BUILDS)
+
+    # The errors are raised before the inputs are used, so a dummy input is enough. It is made of
+    # float32 values, as neural networks only accept these
+    x = numpy.zeros((1, 1), dtype=numpy.float32)
+
+    if verbose:
+        print("Run check_unfitted_error_raises")
+
+    check_unfitted_error_raises(model_class, n_bits, x)
 
 
 @pytest.mark.parametrize("model_class, parameters", sklearn_models_and_datasets)
@@ -1291,7 +1433,7 @@ def test_p_error_global_p_error_simulation(
     model, x = preamble(model_class, parameters, n_bits, load_data, is_weekly_option)
 
     # Check if model is linear
-    is_linear_model = is_model_class_in_a_list(model_class, get_sklearn_linear_models())
+    is_linear_model = is_model_class_in_a_list(model_class, LINEAR_MODELS)
 
     # Compile with a large p_error to be sure the result is random.
     model.compile(x, **error_param)
@@ -1301,12 +1443,10 @@ def test_p_error_global_p_error_simulation(
         predict_function = (
             model.predict_proba if is_classifier_or_partial_classifier(model) else model.predict
         )
-        y_expected = predict_function(x, fhe="disable")
-        for i in range(max_iterations):
-            y_pred = predict_function(x[i : i + 1], fhe=fhe).ravel()
-            if not numpy.array_equal(y_pred, y_expected[i : i + 1].ravel()):
-                return True
-        return False
+        # Predict all the samples in a single call
+        y_expected = predict_function(x[:max_iterations], fhe="disable")
+        y_pred = predict_function(x[:max_iterations], fhe=fhe)
+        return not numpy.array_equal(y_pred, y_expected)
 
     simulation_diff_found = check_for_divergent_predictions(x, model, fhe="simulate")
     fhe_diff_found = check_for_divergent_predictions(x, model, fhe="execute")
@@ -7,7 +7,6 @@ import torch
 import torch.utils
 from sklearn.datasets import load_digits
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 from torch import nn
 from torch.utils.data import DataLoader, TensorDataset
 
@@ -45,36 +44,54 @@ def test_brevitas_tinymnist_cnn(
         x_all, y_all, test_size=0.25, shuffle=True, random_state=numpy.random.randint(0, 2**15)
     )
 
-    def train_one_epoch(net, optimizer, train_loader):
+    def train_one_epoch(net, optimizer, x_train_t, y_train_t, batch_size=64):
         # Cross Entropy loss for classification when not using a softmax layer in the network
         loss = nn.CrossEntropyLoss()
 
         net.train()
         avg_loss = 0
-        for data, target in train_loader:
+
+        # The training set is already in memory, so the mini-batches are directly sliced from it
+        # instead of going through a data loader
+        n_batches = 0
+        for start in range(0, x_train_t.shape[0], batch_size):
+            data = x_train_t[start : start + batch_size]
+            target = y_train_t[start : start + batch_size]
+
             optimizer.zero_grad()
             output = net(data)
-            loss_net = loss(output, target.long())
+            loss_net = loss(output, target)
+
+            # Stop as soon as the training diverges, as the weights would then end up with NaNs
+            if torch.isnan(loss_net):
+                return float("nan")
+
             loss_net.backward()
             optimizer.step()
             avg_loss += loss_net.item()
+            n_batches += 1
+
+        return avg_loss / n_batches
 
-        return avg_loss / len(train_loader)
+    # Train on a GPU if one is available, the network being moved back to the CPU afterwards
+    device = "cuda" if torch.cuda.is_available() else "cpu"
 
     # Prepare the data:
-    # Create a train data loader
-    train_dataset = TensorDataset(torch.Tensor(x_train), torch.Tensor(y_train))
-    train_dataloader = DataLoader(train_dataset, batch_size=64)
+    # Create the training tensors, moved to the training device once for all the epochs
+    x_train_t = torch.from_numpy(x_train.astype(numpy.float32)).to(device)
+    y_train_t = torch.from_numpy(y_train).long().to(device)
 
     # Create a test data loader to supply batches for network evaluation (test)
-    test_dataset = TensorDataset(torch.Tensor(x_test), torch.Tensor(y_test))
-    test_dataloader = DataLoader(test_dataset)
+    test_dataset = TensorDataset(
+        torch.from_numpy(x_test.astype(numpy.float32)), torch.from_numpy(y_test)
+    )
+    test_dataloader = DataLoader(test_dataset, batch_size=256)
 
     trained_ok = False
 
     while not trained_ok:
         # Create the tiny CNN module with 10 output classes
-        net = TinyQATCNN(10, qat_bits, 4 if qat_bits <= 3 else 20, signed, narrow)
+        net = TinyQATCNN(10, qat_bits, 4 if qat_bits <= 3 else 20, signed, narrow).to(device)
 
         # Train a single epoch to have a fast test, accuracy should still be the same for both
         # FHE simulation and torch
@@ -83,8 +100,18 @@ def test_brevitas_tinymnist_cnn(
 
         # Train the network with Adam, output the test set accuracy every epoch
         optimizer = torch.optim.Adam(net.parameters())
+        training_diverged = False
         for _ in range(n_epochs):
-            train_one_epoch(net, optimizer, train_dataloader)
+            if numpy.isnan(train_one_epoch(net, optimizer, x_train_t, y_train_t)):
+                training_diverged = True
+                break
+
+        # If the training diverged, retrain a new network directly, without evaluating this one
+        if training_diverged:
+            continue
+
+        # Evaluation and compilation are done on the CPU
+        net = net.to("cpu")
 
         # Finally, disable pruning (sets the pruned weights to 0)
         net.toggle_pruning(False)
@@ -95,35 +122,25 @@ def test_brevitas_tinymnist_cnn(
         # Retrain while training is bad
         trained_ok = torch_correct > 0
 
-    def test_with_concrete(quantized_module, test_loader, use_fhe_simulation):
+    def test_with_concrete(quantized_module, x_test, y_test, use_fhe_simulation):
         """Test a neural network that is quantized and compiled with Concrete ML."""
 
-        all_targets = numpy.zeros((len(test_loader)), dtype=numpy.int64)
-
-        # Iterate over the test batches and accumulate predictions and ground truth
-        # labels in a vector
-        idx = 0
-        for data, target in test_loader:
-            data = data.numpy()
+        # The whole test set is evaluated as a single batch
+        data = x_test.astype(numpy.float32)
 
-            # Accumulate the ground truth labels
-            endidx = idx + target.shape[0]
-            all_targets[idx:endidx] = target.numpy()
-
-            # Dequantize the integer predictions
-            check_is_good_execution_for_cml_vs_circuit(
-                data, model=quantized_module, simulate=use_fhe_simulation
-            )
+        check_is_good_execution_for_cml_vs_circuit(
+            data, model=quantized_module, simulate=use_fhe_simulation
+        )
 
-            fhe_mode = "simulate" if use_fhe_simulation else "execute"
+        fhe_mode = "simulate" if use_fhe_simulation else "execute"
 
-            y_pred = quantized_module.forward(data, fhe=fhe_mode)
+        y_pred = quantized_module.forward(data, fhe=fhe_mode)
 
-            # Take the predicted class from the outputs and store it
-            y_pred = numpy.argmax(y_pred, axis=1)
+        # Take the predicted classes from the outputs
+        y_pred = numpy.argmax(y_pred, axis=1)
 
-        # Compute and report results
-        n_correct = numpy.sum(all_targets == y_pred)
+        # Compute and report results, the labels being only cast if they are not integers already
+        n_correct = numpy.sum(y_test.astype(numpy.int64, copy=False) == y_pred)
         return n_correct
 
     net.eval()
@@ -136,7 +153,8 @@ def test_brevitas_tinymnist_cnn(
 
     fhe_s_correct = test_with_concrete(
         q_module_simulated,
-        test_dataloader,
+        x_test,
+        y_test,
         use_fhe_simulation=True,
     )
 
@@ -252,10 +270,18 @@ def test_brevitas_intermediary_values(
 
     concrete_model = model_class(**params)
 
-    # Compute mean/stdev on training set and normalize both train and test sets with them
-    normalizer = StandardScaler()
-    x_train = normalizer.fit_transform(x_train)
-    x_test = normalizer.transform(x_test)
+    # Compute mean/stdev on training set and normalize both train and test sets with them, in place
+    x_train = numpy.array(x_train, dtype=numpy.float64)
+    x_test = numpy.array(x_test, dtype=numpy.float64)
+    mean = x_train.mean(axis=0, keepdims=True)
+    std = x_train.std(axis=0, keepdims=True)
+
+    # Constant features are left unscaled, as done by scikit-learn's standard scaler
+    std[std == 0.0] = 1.0
+
+    for x_set in (x_train, x_test):
+        numpy.subtract(x_set, mean, out=x_set)
+        numpy.divide(x_set, std, out=x_set)
 
     concrete_model.fit(x_train, y_train)
 
@@ -263,25 +289,43 @@ def test_brevitas_intermediary_values(
     class DebugQNNModel(SparseQuantNeuralNetwork):
         """Wrapper class that extracts intermediary values from a Brevitas QAT net."""
 
-        intermediary_values = []
-        intermediary_inp_values_float = []
-        quant_weights = []
-        raw_weights = []
-        narrow_range_inp = []
-        narrow_range_weight = []
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+
+            # The values captured during the forward pass
+            self.intermediary_values = []
+            self.intermediary_inp_values_float = []
+            self.quant_weights = []
+            self.raw_weights = []
+            self.narrow_range_inp = []
+            self.narrow_range_weight = []
 
         def forward(self, x):
+            # Capture the intermediary tensors first and only convert them to numpy once the
+            # forward pass is done
+            intermediary_inp_values_float = []
+            intermediary_values = []
+            quant_weights = []
+            raw_weights = []
+
             for mod in self.features:
                 if isinstance(mod, qnn.QuantLinear):
-                    self.intermediary_inp_values_float.append(x.value.detach().numpy())
+                    intermediary_inp_values_float.append(x.value.detach())
                 x = mod(x)
                 if isinstance(mod, qnn.QuantIdentity):
-                    self.intermediary_values.append(x.int().detach().numpy())
+                    intermediary_values.append(x.int().detach())
                     self.narrow_range_inp.append(mod.act_quant.is_narrow_range)
                 elif isinstance(mod, qnn.QuantLinear):
                     self.narrow_range_weight.append(mod.weight_quant.is_narrow_range)
-                    self.quant_weights.append(mod.int_weight().detach().numpy())
-                    self.raw_weights.append(mod.quant_weight().value.detach().numpy())
+                    quant_weights.append(mod.int_weight().detach())
+                    raw_weights.append(mod.quant_weight().value.detach())
+
+            self.intermediary_inp_values_float.extend(
+                t.numpy() for t in intermediary_inp_values_float
+            )
+            self.intermediary_values.extend(t.numpy() for t in intermediary_values)
+            self.quant_weights.extend(t.numpy() for t in quant_weights)
+            self.raw_weights.extend(t.numpy() for t in raw_weights)
             return x
 
     params_module = {
@@ -300,7 +344,8 @@ def test_brevitas_intermediary_values(
     dbg_model.load_state_dict(concrete_model.base_module.state_dict())
 
     # Execute on the test set and capture debug values
-    dbg_model(torch.tensor(x_test.astype(numpy.float64)))
+    with torch.inference_mode():
+        dbg_model(torch.from_numpy(numpy.ascontiguousarray(x_test, dtype=numpy.float64)))
 
     # Execute the Concrete ML model on the test set and capture debug values
     _, cml_debug_values = concrete_model.quantized_module_.forward(
@@ -333,12 +378,12 @@ def test_brevitas_intermediary_values(
 
     # pylint: disable-next=consider-using-enumerate
     for idx in range(len(cml_intermediary_values)):
-        # Check if any activations are different between Brevitas and CML
-        diff_inp = numpy.abs(cml_intermediary_values[idx] - dbg_model.intermediary_values[idx])
-        error = ""
-        if numpy.any(diff_inp) > 0:
-            # If any mismatches, then extract them and print them
-            indices = numpy.nonzero(diff_inp)
+        # Check if any activations are different between Brevitas and CML. The mismatches are only
+        # extracted, in order to print them, if there are some
+        if not numpy.array_equal(cml_intermediary_values[idx], dbg_model.intermediary_values[idx]):
+            indices = numpy.nonzero(
+                cml_intermediary_values[idx] != dbg_model.intermediary_values[idx]
+            )
             error = (
                 f"Mismatched values in layer {idx} at input indices: {numpy.transpose(indices)}\n"
                 f"CML Inputs were: {cml_input_values[idx][indices]} \n"
@@ -347,16 +392,14 @@ def test_brevitas_intermediary_values(
                 f"Brevitas quantized to {dbg_model.intermediary_values[idx][indices]}\n "
                 f"Quant params were {str(cml_quantizers[idx].__dict__)}\n "
             )
-
-        # Assert if there were any mismatches
-        assert numpy.all(diff_inp == 0), error
+            pytest.fail(error)
 
         # Check if any weights are different between Brevitas and CML
-        diff_weights = numpy.abs(cml_quant_weights[idx] - dbg_model.quant_weights[idx])
         weights_ok = True
+        error = ""
 
-        if numpy.any(diff_weights) > 0:
-            indices = numpy.nonzero(diff_weights)
+        if not numpy.array_equal(cml_quant_weights[idx], dbg_model.quant_weights[idx]):
+            indices = numpy.nonzero(cml_quant_weights[idx] != dbg_model.quant_weights[idx])
             diff_raw_weights = numpy.abs(
                 dbg_model.raw_weights[idx][indices] - cml_raw_weights[idx][indices]
             )
@@ -9,10 +9,14 @@ This script does the following:
     - De-quantize the decrypted results
 """
 import base64
+import hashlib
 import io
+import math
 import os
+import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -27,6 +31,8 @@ import torch
 import torchvision
 import torchvision.transforms as transforms
 from clear_module import ClearModule
+from requests_toolbelt import MultipartEncoder
+from torch.utils import data as torch_data
 
 from concrete.ml.deployment import FHEModelClient
 
@@ -35,20 +41,30 @@ IP = os.environ.get("IP", "localhost")
 URL = os.environ.get("URL", f"http://{IP}:{PORT}")
 NUM_SAMPLES = int(os.environ.get("NUM_SAMPLES", 1))
 STATUS_OK = 200
+CLEAR_MODULE_PATH = Path(__file__).parent / "clear_module.pt"
+FEATURES_CACHE_PATH = Path(__file__).parent / "cifar_features.pt"
+IMAGE_TRANSFORM = transforms.Compose(
+    [transforms.ToTensor(), transforms.Normalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5))]
+)
 
 
-def main():
+def get_features_digest() -> str:
+    """Get a digest of what the feature maps are computed from: the clear module and transforms."""
+    digest = hashlib.sha256(CLEAR_MODULE_PATH.read_bytes())
+    digest.update(repr(IMAGE_TRANSFORM).encode())
+    return digest.hexdigest()
+
+
+def compute_features(num_samples: int) -> torch.Tensor:
+    """Pre-process the first CIFAR-10 training images into feature maps using the clear module."""
+
     # Load clear part of the model
     model = ClearModule(out_bit_width=3, in_ch=3)
-    loaded = torch.load(Path(__file__).parent / "clear_module.pt")
+    loaded = torch.load(CLEAR_MODULE_PATH)
     model.load_state_dict(loaded)
-    model = model.eval()
+    model = model.eval().to(memory_format=torch.channels_last)
 
     # Load data
-    IMAGE_TRANSFORM = transforms.Compose(
-        [transforms.ToTensor(), transforms.Normalize((0.5, 0.5, 0.5), (0.5, 0.5, 0.5))]
-    )
-
     try:
         train_set = torchvision.datasets.CIFAR10(
             root=".data/",
@@ -66,36 +82,71 @@ def main():
             target_transform=None,
         )
 
-    num_samples = 1000
-    train_sub_set = torch.stack(
-        [train_set[index][0] for index in range(min(num_samples, len(train_set)))]
+    # Only load the images to infer. Each data-loader worker builds a whole batch, so the images
+    # are split into one batch per worker in order to parallelize their decoding and transforms
+    images_set = torch_data.Subset(train_set, range(min(num_samples, len(train_set))))
+    workers = min(os.cpu_count() or 1, len(images_set))
+    train_loader = torch_data.DataLoader(
+        images_set,
+        batch_size=math.ceil(len(images_set) / workers),
+        shuffle=False,
+        num_workers=workers if workers > 1 else 0,
     )
+    train_sub_set = torch.cat([images for images, _ in train_loader])
 
-    # Pre-processing -> images -> feature maps
-    with torch.no_grad():
-        train_features_sub_set = model(train_sub_set)
+    # Pre-processing -> images -> feature maps. The convolutions are faster on CPU with the
+    # channels-last memory format
+    with torch.inference_mode():
+        train_features_sub_set = model(train_sub_set.to(memory_format=torch.channels_last))
 
-    # Get the necessary data for the client
-    # client.zip
-    zip_response = requests.get(f"{URL}/get_client")
-    assert zip_response.status_code == STATUS_OK
-    with open("./client.zip", "wb") as file:
-        file.write(zip_response.content)
+    # Go back to the default memory format, which is the one expected by the FHE model
+    train_features_sub_set = train_features_sub_set.contiguous()
 
-    # serialized_processing.json
-    zip_response = requests.get(f"{URL}/get_processing")
-    assert zip_response.status_code == STATUS_OK
-    with open("./serialized_processing.json", "wb") as file:
-        file.write(zip_response.content)
+    return train_features_sub_set
 
-    # Get the data to infer
-    X = train_features_sub_set[:1]
+
+def main():
+    # The feature maps are deterministic, so they are cached on the disk to avoid loading the
+    # data-set and running the clear module in the next runs. The cache is stored with a digest of
+    # the clear module and of the transforms, and is only used if they did not change
+    features_digest = get_features_digest()
+    train_features_sub_set = None
+    if FEATURES_CACHE_PATH.exists():
+        features_cache = torch.load(FEATURES_CACHE_PATH, map_location="cpu")
+        if isinstance(features_cache, dict) and features_cache.get("digest") == features_digest:
+            train_features_sub_set = features_cache["features"]
+
+    if train_features_sub_set is None or len(train_features_sub_set) < NUM_SAMPLES:
+        train_features_sub_set = compute_features(NUM_SAMPLES)
+        torch.save(
+            {"digest": features_digest, "features": train_features_sub_set}, FEATURES_CACHE_PATH
+        )
+
+    # Get the necessary data for the client (client.zip and serialized_processing.json), both
+    # files being downloaded concurrently and streamed to the disk by chunks of 1 MiB
+    file_responses = grequests.map(
+        [grequests.get(f"{URL}/get_client"), grequests.get(f"{URL}/get_processing")],
+        stream=True,
+    )
+    for file_name, file_response in zip(
+        ["./client.zip", "./serialized_processing.json"], file_responses
+    ):
+        assert file_response is not None and file_response.status_code == STATUS_OK
+        with file_response, open(file_name, "wb") as file:
+            file_response.raw.decode_content = True
+            shutil.copyfileobj(file_response.raw, file, 1 << 20)
+
+    # Get the data to infer, converted once to a C-contiguous numpy array so that each sample is
+    # sliced from it without any further conversion
+    X = numpy.ascontiguousarray(train_features_sub_set[:NUM_SAMPLES].numpy())
 
     # Let's create the client
     client = FHEModelClient(path_dir="./", key_dir="./keys")
 
-    # The client first need to create the private and evaluation keys.
-    client.generate_private_and_evaluation_keys()
+    # The client first need to create the private and evaluation keys. Keys are saved in key_dir
+    # and, as force is False, the ones from a previous run are loaded back instead of being
+    # generated again, as long as the model's crypto-parameters did not change
+    client.generate_private_and_evaluation_keys(force=False)
 
     # Get the serialized evaluation keys
     serialized_evaluation_keys = client.get_serialized_evaluation_keys()
@@ -104,43 +155,69 @@ def main():
     # Evaluation keys can be quite large files but only have to be shared once with the server.
 
     # Check the size of the evaluation keys (in MB)
-    print(f"Evaluation keys size: {sys.getsizeof(serialized_evaluation_keys) / 1024 / 1024:.2f} MB")
+    print(f"Evaluation keys size: {len(serialized_evaluation_keys) / 1024 / 1024:.2f} MB")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+
+        # Upload the evaluation keys in the background, while the inputs are being encrypted. The
+        # multipart body is streamed from the keys' buffer instead of being built in memory, which
+        # avoids another copy of these large keys
+        key_encoder = MultipartEncoder(
+            fields={
+                "key": (
+                    "key.bin",
+                    io.BytesIO(initial_bytes=serialized_evaluation_keys),
+                    "application/octet-stream",
+                )
+            }
+        )
+        add_key_future = executor.submit(
+            requests.post,
+            f"{URL}/add_key",
+            data=key_encoder,
+            headers={"Content-Type": key_encoder.content_type},
+        )
+
+        # The circuit is compiled for a single sample, so each sample is encrypted separately
+        encrypted_inputs = []
+        for i in range(len(X)):
+            clear_input = X[[i], :]
+            print("Input shape:", clear_input.shape)
+
+            assert isinstance(clear_input, numpy.ndarray)
+            print("Quantize/Encrypt")
+            encrypted_input = client.quantize_encrypt_serialize(clear_input)
+            assert isinstance(encrypted_input, bytes)
+
+            print(f"Encrypted input size: {len(encrypted_input) / 1024 / 1024:.2f} MB")
+            encrypted_inputs.append(encrypted_input)
+
+        response = add_key_future.result()
+
+    # The evaluation keys are not needed anymore once they have been uploaded
+    del key_encoder
+    del serialized_evaluation_keys
 
-    # Update all base64 queries encodings with UploadFile
-    response = requests.post(
-        f"{URL}/add_key",
-        files={"key": io.BytesIO(initial_bytes=serialized_evaluation_keys)},
-    )
     assert response.status_code == STATUS_OK
     uid = response.json()["uid"]
 
+    # Launch the queries, all of them being sent at once and executed asynchronously by grequests
     inferences = []
-    # Launch the queries
-    clear_input = X[[0], :].numpy()
-    print("Input shape:", clear_input.shape)
-
-    assert isinstance(clear_input, numpy.ndarray)
-    print("Quantize/Encrypt")
-    encrypted_input = client.quantize_encrypt_serialize(clear_input)
-    assert isinstance(encrypted_input, bytes)
-
-    print(f"Encrypted input size: {sys.getsizeof(encrypted_input) / 1024 / 1024:.2f} MB")
-
-    print("Posting query")
-    inferences.append(
-        grequests.post(
-            f"{URL}/compute",
-            files={
-                "model_input": io.BytesIO(encrypted_input),
-            },
-            data={
-                "uid": uid,
-            },
+    print("Posting queries")
+    for encrypted_input in encrypted_inputs:
+        inferences.append(
+            grequests.post(
+                f"{URL}/compute",
+                files={
+                    "model_input": io.BytesIO(encrypted_input),
+                },
+                data={
+                    "uid": uid,
+                },
+            )
         )
-    )
 
-    del encrypted_input
-    del serialized_evaluation_keys
+    del encrypted_inputs
 
     print("Posted!")
 
@@ -15,7 +15,6 @@ import time
 
 os.environ["TRANSFORMERS_CACHE"] = "./hf_cache"
 import os
-import sys
 import time
 
 import grequests
@@ -64,7 +63,7 @@ def main():
     assert isinstance(serialized_evaluation_keys, bytes)
     # Evaluation keys can be quite large files but only have to be shared once with the server.
     # Check the size of the evaluation keys (in MB)
-    print(f"Evaluation keys size: {sys.getsizeof(serialized_evaluation_keys) / 1024 / 1024:.2f} MB")
+    print(f"Evaluation keys size: {len(serialized_evaluation_keys) / 1024 / 1024:.2f} MB")
 
     response = requests.post(
         f"{URL}/add_key",
@@ -88,7 +87,7 @@ def main():
         print("Quantize/Encrypt")
         encrypted_input = client.quantize_encrypt_serialize(clear_input)
         assert isinstance(encrypted_input, bytes)
-        print(f"Encrypted input size: {sys.getsizeof(encrypted_input) / 1024 / 1024:.2f} MB")
+        print(f"Encrypted input size: {len(encrypted_input) / 1024 / 1024:.2f} MB")
 
         print("Posting query ...")
         inferences = [